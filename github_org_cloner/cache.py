@@ -0,0 +1,126 @@
+"""On-disk cache for GitHub API responses."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Default location for cached API responses
+CACHE_DIR = Path.home() / ".cache" / "github-org-cloner"
+
+# How long a cached repository list is considered fresh, in seconds
+REPOS_TTL = 300
+
+
+def _repos_path(cache_dir: Path, key: str) -> Path:
+    """Return the cache file path for a repository list key."""
+    return cache_dir / f"{key}.json"
+
+
+def _page_path(cache_dir: Path, key: str) -> Path:
+    """Return the cache file path for a page key."""
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    return cache_dir / "pages" / f"{digest}.json"
+
+
+def _write_json(path: Path, payload: Any) -> None:
+    """Atomically write a JSON payload, ignoring filesystem errors.
+
+    Args:
+        path: Destination file.
+        payload: JSON-serializable data to write.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp_name, path)
+    except OSError as e:
+        logger.debug(f"Failed to write cache file {path}: {e}")
+
+
+def get(cache_dir: Path, key: str, ttl: float = REPOS_TTL) -> list[dict[str, Any]] | None:
+    """Load a cached repository list if it is still fresh.
+
+    Args:
+        cache_dir: Directory holding cached responses.
+        key: Cache key identifying the organization.
+        ttl: Maximum age of the cache file, in seconds.
+
+    Returns:
+        The cached repository dicts, or None if missing, stale or unreadable.
+    """
+    path = _repos_path(cache_dir, key)
+    try:
+        if time.time() - path.stat().st_mtime >= ttl:
+            return None
+        with path.open() as f:
+            repos: list[dict[str, Any]] = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return repos
+
+
+def put(cache_dir: Path, key: str, repos: list[dict[str, Any]]) -> None:
+    """Store a repository list.
+
+    Args:
+        cache_dir: Directory holding cached responses.
+        key: Cache key identifying the organization.
+        repos: Repository dicts to cache.
+    """
+    _write_json(_repos_path(cache_dir, key), repos)
+
+
+def load_page(cache_dir: Path, key: str) -> dict[str, Any] | None:
+    """Load a cached API page.
+
+    Args:
+        cache_dir: Directory holding cached responses.
+        key: Cache key identifying the request (usually its full URL).
+
+    Returns:
+        A dict with ``etag``, ``last_modified``, ``data`` and ``links``
+        entries, or None if the page is not cached or the cache file is
+        unreadable. Either validator may be None; pages cached by older
+        versions have no ``last_modified`` entry.
+    """
+    try:
+        with _page_path(cache_dir, key).open() as f:
+            entry: dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return entry
+
+
+def store_page(
+    cache_dir: Path,
+    key: str,
+    etag: str | None,
+    data: Any,
+    links: dict[str, dict[str, str]],
+    last_modified: str | None = None,
+) -> None:
+    """Store an API page along with the validators it was served with.
+
+    Args:
+        cache_dir: Directory holding cached responses.
+        key: Cache key identifying the request (usually its full URL).
+        etag: ETag header returned by the API, if any.
+        data: Parsed JSON body of the response.
+        links: Parsed Link header of the response.
+        last_modified: Last-Modified header returned by the API, if any.
+    """
+    _write_json(
+        _page_path(cache_dir, key),
+        {"etag": etag, "last_modified": last_modified, "data": data, "links": links},
+    )
@@ -1,14 +1,19 @@
 """Command-line interface for the GitHub organization cloner."""
 
 import argparse
+import atexit
 import getpass
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+from collections.abc import Callable
 
 from . import __version__
-from .cloner import clone_all_repositories
-from .config import Config
+from .cache import CACHE_DIR
+from .cloner import clone_all_repositories, prewarm_dns
+from .config import Config, load_environment
 from .github_client import (
     GitHubAPIError,
     GitHubClient,
@@ -18,18 +23,64 @@ from .github_client import (
 from .setup_runner import run_setup_for_all
 
 
+class _TqdmStreamHandler(logging.StreamHandler):
+    """Stream handler that writes through tqdm, keeping progress bars intact."""
+
+    def __init__(self, write: Callable[..., None]) -> None:
+        """Initialize the handler.
+
+        Args:
+            write: ``tqdm.write``, which prints above any active progress bar.
+        """
+        super().__init__()
+        self._write = write
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record above any active progress bar.
+
+        Args:
+            record: Log record to write.
+        """
+        try:
+            self._write(self.format(record), file=self.stream)
+        except Exception:
+            self.handleError(record)
+
+
 def setup_logging(verbose: bool = False) -> None:
     """Configure logging for the application.
 
+    Records are handed to a background listener thread through a queue, so
+    clone and setup worker threads don't block on writing to the terminal.
+    When tqdm is installed, records are written through it so they don't
+    break up the clone progress bar.
+
     Args:
         verbose: If True, set log level to DEBUG, otherwise INFO.
     """
     level = logging.DEBUG if verbose else logging.INFO
 
-    logging.basicConfig(
-        level=level,
-        format="%(levelname)s: %(message)s",
-    )
+    root = logging.getLogger()
+    if root.handlers:
+        return  # Already configured, as with logging.basicConfig
+
+    handler: logging.StreamHandler
+    try:
+        from tqdm import tqdm
+    except ImportError:
+        handler = logging.StreamHandler()
+    else:
+        handler = _TqdmStreamHandler(tqdm.write)
+    handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+
+    # Worker threads only enqueue records; a single listener thread writes them out
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
 
 
 def get_github_token(token_arg: str | None) -> str | None:
@@ -65,11 +116,11 @@ def get_github_token(token_arg: str | None) -> str | None:
         return None
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command-line arguments.
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser.
 
     Returns:
-        Parsed arguments.
+        The argument parser.
     """
     parser = argparse.ArgumentParser(
         description="Clone all repositories from a GitHub organization.",
@@ -79,10 +130,14 @@ Examples:
   %(prog)s https://github.com/openai --base-dir ~/code
   %(prog)s https://github.com/openai --parallel --max-workers 4
   %(prog)s openai --base-dir ~/code --run-setup --dry-run
+  %(prog)s https://github.com/openai --parallel --shallow
+  %(prog)s https://github.com/openai --no-skip-forks --no-include-private
 
 Environment Variables:
   GITHUB_ORG_CLONE_BASE_DIR  Base directory for cloning (can be overridden by --base-dir)
   GITHUB_TOKEN               GitHub personal access token for API authentication
+  GITHUB_ORG_CLONER_MAX_WORKERS
+                             Maximum parallel workers (can be overridden by --max-workers)
         """,
     )
 
@@ -112,7 +167,59 @@ Environment Variables:
     parser.add_argument(
         "--max-workers",
         type=int,
-        help="Maximum number of parallel workers (default: number of CPUs)",
+        help="Maximum number of parallel workers "
+        "(overrides GITHUB_ORG_CLONER_MAX_WORKERS env var; "
+        "default: one per repository, at most 32)",
+    )
+
+    parser.add_argument(
+        "--depth",
+        type=int,
+        help="Create shallow clones with history truncated to this many commits",
+    )
+
+    parser.add_argument(
+        "--shallow",
+        action="store_true",
+        help="Clone only the latest commit of each default branch "
+        "(--depth 1 --single-branch --filter=blob:none)",
+    )
+
+    filter_group = parser.add_mutually_exclusive_group()
+    filter_group.add_argument(
+        "--filter",
+        dest="filter_spec",
+        metavar="FILTER",
+        help="Partial clone filter passed to git clone, e.g. blob:none "
+        "(default with --shallow: blob:none)",
+    )
+    filter_group.add_argument(
+        "--filter-blobs",
+        dest="filter_spec",
+        action="store_const",
+        const="blob:none",
+        help="Fetch file contents on demand (same as --filter blob:none)",
+    )
+
+    parser.add_argument(
+        "--skip-forks",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Leave out forked repositories",
+    )
+
+    parser.add_argument(
+        "--skip-archived",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Leave out archived repositories",
+    )
+
+    parser.add_argument(
+        "--include-private",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Include private repositories (only listed with a token)",
     )
 
     parser.add_argument(
@@ -127,6 +234,12 @@ Environment Variables:
         help="Show what would be done without actually cloning",
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Fetch the repository list from GitHub even if a recent cached copy exists",
+    )
+
     parser.add_argument(
         "--verbose",
         "-v",
@@ -140,7 +253,19 @@ Environment Variables:
         version=f"%(prog)s {__version__}",
     )
 
-    return parser.parse_args()
+    return parser
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Arguments to parse. Defaults to ``sys.argv[1:]``.
+
+    Returns:
+        Parsed arguments.
+    """
+    return _build_parser().parse_args(argv)
 
 
 def get_org_url(org_url_arg: str | None) -> str:
@@ -175,6 +300,9 @@ def main() -> None:
     setup_logging(verbose=args.verbose)
     logger = logging.getLogger(__name__)
 
+    # Load .env before reading the token from the environment
+    load_environment()
+
     # Get organization URL
     org_url = get_org_url(args.org_url)
 
@@ -190,6 +318,13 @@ def main() -> None:
             max_workers=args.max_workers,
             run_setup=args.run_setup,
             dry_run=args.dry_run,
+            use_cache=not args.no_cache,
+            depth=args.depth,
+            shallow=args.shallow,
+            filter_spec=args.filter_spec,
+            skip_forks=args.skip_forks,
+            skip_archived=args.skip_archived,
+            include_private=args.include_private,
         )
     except ValueError as e:
         logger.error(str(e))
@@ -202,7 +337,7 @@ def main() -> None:
         logger.info("DRY RUN MODE - No repositories will be cloned")
 
     # Initialize GitHub client
-    client = GitHubClient(token=config.github_token)
+    client = GitHubClient(token=config.github_token, cache_dir=CACHE_DIR)
 
     # Parse organization name from URL
     try:
@@ -215,7 +350,13 @@ def main() -> None:
     # Fetch repositories
     try:
         logger.info(f"Fetching repositories for {org_name}...")
-        repos = client.list_org_repositories(org_name)
+        repos = client.list_org_repositories(
+            org_name,
+            use_cache=config.use_cache,
+            include_forks=not config.skip_forks,
+            include_archived=not config.skip_archived,
+            include_private=config.include_private,
+        )
     except OrganizationNotFoundError as e:
         logger.error(str(e))
         sys.exit(1)
@@ -230,6 +371,10 @@ def main() -> None:
         logger.warning(f"No repositories found for organization '{org_name}'")
         sys.exit(0)
 
+    # Resolve the git host once before many git processes look it up
+    if not config.dry_run:
+        prewarm_dns(repos)
+
     # Clone repositories
     try:
         results = clone_all_repositories(
@@ -239,6 +384,11 @@ def main() -> None:
             parallel=config.parallel,
             max_workers=config.max_workers,
             dry_run=config.dry_run,
+            token=config.github_token,
+            depth=config.depth,
+            filter_spec=config.filter_spec,
+            single_branch=config.single_branch,
+            use_map=config.dry_run,
         )
     except Exception as e:
         logger.error(f"Error during cloning: {e}")
@@ -247,10 +397,9 @@ def main() -> None:
     # Run setup if requested and not in dry-run mode
     if config.run_setup and not config.dry_run:
         # Get paths of successfully cloned repos
+        org_dir = config.base_dir / org_name
         successful_repos = [
-            config.base_dir / org_name / repo_name
-            for repo_name, (success, _) in results.items()
-            if success
+            org_dir / repo_name for repo_name, (success, _) in results.items() if success
         ]
 
         if successful_repos:
@@ -1,14 +1,35 @@
 """Repository cloning logic with support for sequential and parallel execution."""
 
 import logging
+import os
+import socket
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import as_completed
+from functools import partial
 from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
 
 from .github_client import Repository
+from .pool import get_pool
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for the default worker count, to avoid saturating the git server
+MAX_DEFAULT_WORKERS = 32
+
+# Protocol v2 only advertises the refs a clone asks for; HTTP/2 cuts request overhead
+GIT_CONFIG_OPTIONS = ["-c", "protocol.version=2", "-c", "http.version=HTTP/2"]
+
+# Maximum time a single clone may take, in seconds
+CLONE_TIMEOUT = 300
+
+# libgit2 connect and read timeout for pygit2 clones, in seconds
+SERVER_TIMEOUT = 60
+
 
 class CloneError(Exception):
     """Raised when a repository clone operation fails."""
@@ -16,19 +37,78 @@ class CloneError(Exception):
     pass
 
 
+def default_max_workers(repo_count: int) -> int:
+    """Return the default number of parallel clone workers.
+
+    Cloning is bound by network and disk I/O rather than CPU, so this uses one
+    worker per repository, capped at MAX_DEFAULT_WORKERS. Too many concurrent
+    clones exhaust file descriptors; too few leave the network idle.
+
+    Args:
+        repo_count: Number of repositories to clone.
+
+    Returns:
+        Number of workers to use.
+    """
+    return min(max(1, repo_count), MAX_DEFAULT_WORKERS)
+
+
+def prewarm_dns(repos: Iterable[Repository]) -> None:
+    """Resolve the hosts that repositories will be cloned from.
+
+    Each ``git clone`` runs in its own process and resolves the host again;
+    resolving every distinct host once up front primes caching resolvers
+    (such as systemd-resolved or nscd) so those lookups return immediately.
+    Resolution failures are ignored and left for git to report.
+
+    Args:
+        repos: Repositories that are about to be cloned.
+    """
+    hosts = {urlparse(repo.clone_url).hostname for repo in repos}
+
+    for host in sorted(filter(None, hosts)):
+        try:
+            socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+        except OSError as e:
+            logger.debug(f"Could not resolve {host}: {e}")
+
+
 def clone_repository(
     repo: Repository,
     org_name: str,
     base_dir: Path,
     dry_run: bool = False,
+    token: str | None = None,
+    depth: int | None = None,
+    filter_spec: str | None = None,
+    single_branch: bool = False,
+    existing_names: frozenset[str] | None = None,
+    org_dir: Path | None = None,
+    parent_created: bool = False,
 ) -> tuple[str, bool, str | None]:
     """Clone a single repository.
 
+    Uses libgit2 (via the optional ``pygit2`` package) to clone in-process when
+    it is installed, and falls back to running ``git clone`` otherwise.
+
     Args:
         repo: Repository to clone.
         org_name: Organization name (used for directory structure).
         base_dir: Base directory where repos are cloned.
         dry_run: If True, don't actually clone, just report what would happen.
+        token: GitHub token used to authenticate pygit2 clones.
+        depth: If set, create a shallow clone truncated to this many commits.
+        filter_spec: Partial clone filter (e.g. ``blob:none``). Only supported
+            by the git command line client.
+        single_branch: If True, only fetch the default branch. Only supported
+            by the git command line client.
+        existing_names: Names of the directories already present in the
+            organization directory. When given, it is used instead of checking
+            the filesystem for the target path.
+        org_dir: Precomputed ``base_dir / org_name`` directory, to avoid
+            rebuilding it for every repository.
+        parent_created: If True, the organization directory is known to exist
+            and is not created again.
 
     Returns:
         A tuple of (repo_name, success, error_message).
@@ -36,37 +116,140 @@ def clone_repository(
     Raises:
         CloneError: If the clone operation fails (when not in dry_run mode).
     """
-    target_path = base_dir / org_name / repo.name
+    target = os.path.join(org_dir or base_dir / org_name, repo.name)
+
+    # Check if repository already exists, with a plain stat rather than a Path
+    if existing_names is not None:
+        exists = repo.name in existing_names
+    else:
+        exists = os.path.exists(target)
 
-    # Check if repository already exists
-    if target_path.exists():
-        logger.warning(f"Repository '{repo.name}' already exists at {target_path}, skipping")
+    if exists:
+        logger.warning(f"Repository '{repo.name}' already exists at {target}, skipping")
         return (repo.name, False, "Already exists")
 
+    target_path = Path(target)
+
     if dry_run:
         logger.info(f"[DRY RUN] Would clone {repo.name} to {target_path}")
         return (repo.name, True, None)
 
     # Ensure parent directory exists
-    target_path.parent.mkdir(parents=True, exist_ok=True)
+    if not parent_created:
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+
+    logger.debug(f"Cloning {repo.name} to {target_path}")
+
+    try:
+        import pygit2
+    except ImportError:
+        use_pygit2 = False
+    else:
+        # libgit2 cannot make partial or single-branch clones
+        use_pygit2 = not (filter_spec or single_branch)
+
+    if not use_pygit2:
+        options = []
+        if depth:
+            options.append(f"--depth={depth}")
+        if single_branch:
+            options.append("--single-branch")
+        if filter_spec:
+            options.append(f"--filter={filter_spec}")
+        return _clone_with_git(repo, target_path, options)
+
+    return _clone_with_pygit2(pygit2, repo, target_path, token, depth)
+
+
+def _clone_with_pygit2(
+    pygit2: Any,
+    repo: Repository,
+    target_path: Path,
+    token: str | None,
+    depth: int | None = None,
+) -> tuple[str, bool, str | None]:
+    """Clone a repository in-process using libgit2.
 
-    logger.info(f"Cloning {repo.name} to {target_path}")
+    Args:
+        pygit2: The imported pygit2 module.
+        repo: Repository to clone.
+        target_path: Directory to clone into.
+        token: GitHub token used for HTTPS authentication.
+        depth: If set, create a shallow clone truncated to this many commits.
+
+    Returns:
+        A tuple of (repo_name, success, error_message).
+    """
+    credentials = pygit2.UserPass(token, "x-oauth-basic") if token else None
+    callbacks = pygit2.RemoteCallbacks(credentials=credentials)
+
+    # libgit2 has no overall timeout; abort from the progress callbacks once the
+    # deadline passes, as pygit2 re-raises callback exceptions from the clone.
+    # The callbacks only run as data arrives, so the (process-wide) server
+    # timeouts fail stalled connections; a clone that stalls just before the
+    # deadline may run up to SERVER_TIMEOUT past it
+    pygit2.settings.server_connect_timeout = SERVER_TIMEOUT * 1000
+    pygit2.settings.server_timeout = SERVER_TIMEOUT * 1000
+    deadline = time.monotonic() + CLONE_TIMEOUT
+
+    def check_deadline(*args: Any) -> None:
+        if time.monotonic() > deadline:
+            raise TimeoutError
+
+    callbacks.transfer_progress = check_deadline
+    callbacks.sideband_progress = check_deadline
 
     try:
-        # Run git clone
+        pygit2.clone_repository(
+            repo.clone_url, str(target_path), callbacks=callbacks, depth=depth or 0
+        )
+    except TimeoutError:
+        error_msg = f"Clone timeout for {repo.name} (exceeded 5 minutes)"
+        logger.error(error_msg)
+        return (repo.name, False, error_msg)
+    except (pygit2.GitError, ValueError) as e:
+        error_msg = f"Failed to clone {repo.name}: {e}"
+        logger.error(error_msg)
+        return (repo.name, False, error_msg)
+
+    logger.debug(f"Successfully cloned {repo.name}")
+    return (repo.name, True, None)
+
+
+def _clone_with_git(
+    repo: Repository,
+    target_path: Path,
+    options: list[str],
+) -> tuple[str, bool, str | None]:
+    """Clone a repository by running the git command line client.
+
+    Args:
+        repo: Repository to clone.
+        target_path: Directory to clone into.
+        options: Extra options passed to ``git clone``.
+
+    Returns:
+        A tuple of (repo_name, success, error_message).
+
+    Raises:
+        CloneError: If git is not installed.
+    """
+    try:
+        # Run git clone; only stderr is kept, as bytes, and decoded on failure
         subprocess.run(
-            ["git", "clone", repo.clone_url, str(target_path)],
-            capture_output=True,
-            text=True,
-            timeout=300,  # 5 minute timeout per repo
+            ["git", *GIT_CONFIG_OPTIONS, "clone", *options, repo.clone_url, str(target_path)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=CLONE_TIMEOUT,
             check=True,
         )
 
-        logger.info(f"Successfully cloned {repo.name}")
+        logger.debug(f"Successfully cloned {repo.name}")
         return (repo.name, True, None)
 
     except subprocess.CalledProcessError as e:
-        error_msg = f"Failed to clone {repo.name}: {e.stderr}"
+        stderr = e.stderr.decode("utf-8", "replace") if isinstance(e.stderr, bytes) else e.stderr
+        error_msg = f"Failed to clone {repo.name}: {stderr}"
         logger.error(error_msg)
         return (repo.name, False, error_msg)
 
@@ -88,6 +271,11 @@ def clone_all_repositories(
     parallel: bool = False,
     max_workers: int | None = None,
     dry_run: bool = False,
+    token: str | None = None,
+    depth: int | None = None,
+    filter_spec: str | None = None,
+    single_branch: bool = False,
+    use_map: bool = False,
 ) -> dict[str, tuple[bool, str | None]]:
     """Clone all repositories for an organization.
 
@@ -97,7 +285,15 @@ def clone_all_repositories(
         base_dir: Base directory where repos are cloned.
         parallel: If True, clone repositories in parallel.
         max_workers: Maximum number of parallel workers (only used if parallel=True).
+            Defaults to default_max_workers() for the repositories to clone.
         dry_run: If True, don't actually clone, just report what would happen.
+        token: GitHub token used to authenticate pygit2 clones.
+        depth: If set, create shallow clones truncated to this many commits.
+        filter_spec: Partial clone filter (e.g. ``blob:none``).
+        single_branch: If True, only fetch each repository's default branch.
+        use_map: If True (and parallel=True), collect results in submission order
+            with ``Executor.map``. Suited to uniform tasks such as dry runs; by
+            default results are collected as each clone completes.
 
     Returns:
         Dictionary mapping repo names to (success, error_message) tuples.
@@ -117,55 +313,102 @@ def clone_all_repositories(
         org_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Cloning repositories to: {org_dir}")
 
-    results = {}
+    results: dict[str, tuple[bool, str | None]] = {}
+
+    # List the organization directory once instead of checking each target path;
+    # frozen because every worker reads it concurrently
+    try:
+        existing_names = frozenset(entry.name for entry in os.scandir(org_dir))
+    except OSError:
+        existing_names = frozenset()
+
+    to_clone: list[Repository] = []
+    for repo in repos:
+        if repo.name in existing_names:
+            logger.warning(
+                f"Repository '{repo.name}' already exists at {org_dir / repo.name}, skipping"
+            )
+            results[repo.name] = (False, "Already exists")
+        else:
+            to_clone.append(repo)
+
+    clone = partial(
+        clone_repository,
+        org_name=org_name,
+        base_dir=base_dir,
+        dry_run=dry_run,
+        token=token,
+        depth=depth,
+        filter_spec=filter_spec,
+        single_branch=single_branch,
+        existing_names=existing_names,
+        org_dir=org_dir,
+        parent_created=True,  # Created above (dry runs never reach the mkdir)
+    )
+
+    if not to_clone:
+        logger.info("All repositories already exist, nothing to clone")
+    elif parallel:
+        # Parallel cloning on the shared thread pool
+        if max_workers is None:
+            max_workers = default_max_workers(len(to_clone))
 
-    if parallel:
-        # Parallel cloning with ThreadPoolExecutor
         logger.info(f"Cloning in parallel with max_workers={max_workers}")
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all clone tasks
-            future_to_repo = {
-                executor.submit(
-                    clone_repository,
-                    repo,
-                    org_name,
-                    base_dir,
-                    dry_run,
-                ): repo
-                for repo in repos
-            }
-
-            # Process completed tasks
-            completed = 0
-            for future in as_completed(future_to_repo):
-                repo = future_to_repo[future]
+        # The shared pool may be larger, so bound the clones in flight here
+        slots = threading.BoundedSemaphore(max_workers)
+
+        def clone_with_slot(repo: Repository) -> tuple[str, bool, str | None]:
+            with slots:
                 try:
-                    repo_name, success, error = future.result()
-                    results[repo_name] = (success, error)
-                    completed += 1
-                    logger.info(f"Progress: {completed}/{len(repos)} repositories processed")
+                    return clone(repo)
                 except Exception as e:
                     logger.error(f"Unexpected error cloning {repo.name}: {e}")
-                    results[repo.name] = (False, str(e))
-                    completed += 1
+                    return (repo.name, False, str(e))
+
+        executor = get_pool(max_workers)
+
+        outcomes: Iterator[tuple[str, bool, str | None]]
+        if use_map:
+            # Results arrive in submission order, without per-future bookkeeping
+            outcomes = executor.map(clone_with_slot, to_clone)
+        else:
+            # Results arrive as soon as each clone finishes
+            futures = [executor.submit(clone_with_slot, repo) for repo in to_clone]
+            outcomes = (future.result() for future in as_completed(futures))
+
+        # A single progress bar (or an occasional progress line) instead of a
+        # log record per repository, which would contend for the logging lock
+        try:
+            from tqdm import tqdm
+        except ImportError:
+            progress_bar = None
+        else:
+            progress_bar = tqdm(total=len(to_clone), unit="repo", desc="Cloning")
+
+        log_every = max(1, len(to_clone) // 10)
+
+        for completed, (repo_name, success, error) in enumerate(outcomes, 1):
+            results[repo_name] = (success, error)
+            if progress_bar is not None:
+                progress_bar.update()
+            elif completed % log_every == 0 or completed == len(to_clone):
+                logger.info(f"Progress: {completed}/{len(to_clone)} repositories processed")
+
+        if progress_bar is not None:
+            progress_bar.close()
     else:
         # Sequential cloning
         logger.info("Cloning sequentially")
 
-        for i, repo in enumerate(repos, 1):
-            logger.info(f"Progress: {i}/{len(repos)}")
+        for i, repo in enumerate(to_clone, 1):
+            logger.info(f"Progress: {i}/{len(to_clone)}")
             try:
-                repo_name, success, error = clone_repository(
-                    repo,
-                    org_name,
-                    base_dir,
-                    dry_run,
-                )
+                repo_name, success, error = clone(repo)
                 results[repo_name] = (success, error)
             except Exception as e:
                 logger.error(f"Unexpected error cloning {repo.name}: {e}")
-                results[repo_name] = (False, str(e))
+                results[repo.name] = (False, str(e))
 
     # Summary
     successful = sum(1 for success, _ in results.values() if success)
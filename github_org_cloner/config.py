@@ -6,8 +6,22 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
-# Load .env file from current directory or parent directories
-load_dotenv()
+_env_loaded = False
+
+
+def load_environment() -> None:
+    """Load variables from a .env file into the environment.
+
+    The .env file is searched for in the current directory and its parents.
+    This is done lazily, on first call, rather than at import time so that
+    ``--help``, ``--version`` and test collection don't pay for the search.
+    Variables already set in the environment take precedence.
+    """
+    global _env_loaded
+
+    if not _env_loaded:
+        load_dotenv(override=False)
+        _env_loaded = True
 
 
 @dataclass
@@ -21,6 +35,13 @@ class Config:
         max_workers: Maximum number of parallel workers.
         run_setup: Whether to run setup scripts after cloning.
         dry_run: Whether to perform a dry run without actually cloning.
+        use_cache: Whether to reuse a recently cached repository list.
+        depth: Truncate cloned history to this many commits (None for full history).
+        filter_spec: Partial clone filter passed to git (e.g. ``blob:none``).
+        single_branch: Whether to clone only each repository's default branch.
+        skip_forks: Whether to leave out forked repositories.
+        skip_archived: Whether to leave out archived repositories.
+        include_private: Whether to include private repositories.
     """
 
     base_dir: Path
@@ -29,6 +50,13 @@ class Config:
     max_workers: int | None = None
     run_setup: bool = False
     dry_run: bool = False
+    use_cache: bool = True
+    depth: int | None = None
+    filter_spec: str | None = None
+    single_branch: bool = False
+    skip_forks: bool = True
+    skip_archived: bool = True
+    include_private: bool = True
 
     @classmethod
     def from_args(
@@ -39,6 +67,13 @@ class Config:
         max_workers: int | None = None,
         run_setup: bool = False,
         dry_run: bool = False,
+        use_cache: bool = True,
+        depth: int | None = None,
+        shallow: bool = False,
+        filter_spec: str | None = None,
+        skip_forks: bool = True,
+        skip_archived: bool = True,
+        include_private: bool = True,
     ) -> "Config":
         """Create a Config instance from command-line arguments and environment variables.
 
@@ -51,17 +86,30 @@ class Config:
             base_dir: Base directory path (overrides env var if provided).
             github_token: GitHub token (overrides env var if provided).
             parallel: Enable parallel cloning.
-            max_workers: Maximum number of parallel workers.
+            max_workers: Maximum number of parallel workers (overrides env var if provided).
             run_setup: Run setup scripts after cloning.
             dry_run: Perform a dry run without cloning.
+            use_cache: Reuse a recently cached repository list.
+            depth: Truncate cloned history to this many commits.
+            shallow: Clone only the latest commit of the default branch. Implies
+                depth 1, a single branch, and the ``blob:none`` filter unless
+                depth or filter_spec are given.
+            filter_spec: Partial clone filter passed to git.
+            skip_forks: Leave out forked repositories.
+            skip_archived: Leave out archived repositories.
+            include_private: Include private repositories.
 
         Returns:
             A Config instance.
 
         Raises:
             ValueError: If base_dir is not provided via argument,
-                environment variable, or .env file.
+                environment variable, or .env file, if max_workers or
+                GITHUB_ORG_CLONER_MAX_WORKERS is not a positive integer,
+                or if depth is less than 1.
         """
+        load_environment()
+
         # Determine base directory from CLI arg or env var (which includes .env)
         final_base_dir = base_dir or os.getenv("GITHUB_ORG_CLONE_BASE_DIR")
 
@@ -74,11 +122,38 @@ class Config:
         # Determine GitHub token from CLI arg or env var (which includes .env)
         final_token = github_token or os.getenv("GITHUB_TOKEN")
 
+        # Determine worker count from CLI arg or env var (which includes .env)
+        final_max_workers = max_workers
+        env_max_workers = os.getenv("GITHUB_ORG_CLONER_MAX_WORKERS")
+        if final_max_workers is None and env_max_workers:
+            if not env_max_workers.isdigit() or int(env_max_workers) < 1:
+                raise ValueError(
+                    "GITHUB_ORG_CLONER_MAX_WORKERS must be a positive integer, "
+                    f"got '{env_max_workers}'"
+                )
+            final_max_workers = int(env_max_workers)
+        elif final_max_workers is not None and final_max_workers < 1:
+            raise ValueError(f"Max workers must be a positive integer, got {final_max_workers}")
+
+        if depth is not None and depth < 1:
+            raise ValueError(f"Clone depth must be a positive integer, got {depth}")
+
+        if shallow:
+            depth = depth or 1
+            filter_spec = filter_spec or "blob:none"
+
         return cls(
             base_dir=Path(final_base_dir).expanduser().resolve(),
             github_token=final_token,
             parallel=parallel,
-            max_workers=max_workers,
+            max_workers=final_max_workers,
             run_setup=run_setup,
             dry_run=dry_run,
+            use_cache=use_cache,
+            depth=depth,
+            filter_spec=filter_spec,
+            single_branch=shallow,
+            skip_forks=skip_forks,
+            skip_archived=skip_archived,
+            include_private=include_private,
         )
@@ -1,27 +1,71 @@
 """GitHub API client for fetching organization repositories."""
 
+import functools
+import json
+import logging
 import re
-from dataclasses import dataclass
-from urllib.parse import urlparse
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from . import cache
+from .pool import get_pool
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Prefer orjson for parsing API responses when it is installed
+_json_loads: Callable[[bytes], Any]
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# GitHub username/organization rules: alphanumerics and inner hyphens
+_ORG_NAME_RE = re.compile(r"^[a-zA-Z0-9]([a-zA-Z0-9-]*[a-zA-Z0-9])?$")
+
+# A github.com URL, capturing the first path component
+_GITHUB_URL_RE = re.compile(
+    r"https?://(?:www\.)?github\.com(?![^/?#])/*(?P<org>[^/?#]*)(?P<rest>[^?#]*)"
+)
+
+# Characters urlparse silently drops from URLs (tab, newline, carriage return)
+_URL_UNSAFE_CHARS = str.maketrans("", "", "\t\r\n")
+
+
+@dataclass(frozen=True, slots=True)
 class Repository:
     """Represents a GitHub repository.
 
+    Instances are immutable and slotted, since large organizations yield
+    thousands of them and they are shared across clone worker threads.
+
     Attributes:
         name: Repository name.
         clone_url: HTTPS clone URL.
         ssh_url: SSH clone URL.
         description: Repository description.
+        fork: Whether the repository is a fork.
+        archived: Whether the repository is archived.
+        private: Whether the repository is private.
     """
 
     name: str
     clone_url: str
     ssh_url: str
     description: str | None
+    fork: bool = False
+    archived: bool = False
+    private: bool = False
 
 
 class GitHubAPIError(Exception):
@@ -43,19 +87,82 @@ class RateLimitError(GitHubAPIError):
 
 
 class GitHubClient:
-    """Client for interacting with the GitHub REST API."""
+    """Client for interacting with the GitHub REST and GraphQL APIs."""
 
     BASE_URL = "https://api.github.com"
+    GRAPHQL_URL = f"{BASE_URL}/graphql"
     PER_PAGE = 100  # Maximum allowed by GitHub API
+    MAX_PAGE_WORKERS = 8  # Concurrent REST page requests
+    POOL_SIZE = 16  # Keep-alive connections per host
+    RATE_LIMIT_THRESHOLD = 5  # Pause until reset when fewer requests remain
+    MAX_RATE_LIMIT_RETRIES = 3  # Retries for secondary rate limit responses
+
+    # Fetch only the fields used to build Repository objects
+    REPOSITORIES_QUERY = """
+    query(
+      $login: String!
+      $cursor: String
+      $isFork: Boolean
+      $isArchived: Boolean
+      $privacy: RepositoryPrivacy
+    ) {
+      organization(login: $login) {
+        repositories(
+          first: 100
+          after: $cursor
+          isFork: $isFork
+          isArchived: $isArchived
+          privacy: $privacy
+        ) {
+          pageInfo { endCursor hasNextPage }
+          nodes { name url sshUrl description isFork isArchived isPrivate }
+        }
+      }
+    }
+    """
 
-    def __init__(self, token: str | None = None):
+    def __init__(
+        self,
+        token: str | None = None,
+        cache_dir: Path | None = None,
+        session: requests.Session | None = None,
+    ):
         """Initialize the GitHub client.
 
         Args:
             token: GitHub personal access token for authentication.
+            cache_dir: Directory for caching API responses. Caching is
+                disabled when None.
+            session: Session used to send requests. A new session with a
+                pooled, retrying HTTPS adapter is created when None; a given
+                session keeps its own adapters.
         """
         self.token = token
-        self.session = requests.Session()
+        self.cache_dir = cache_dir
+
+        # Lowest remaining request count and its reset time seen in the current
+        # rate limit window; updated from page worker threads, so guarded by a lock
+        self._rate_limit: tuple[int, int] | None = None
+        self._rate_limit_lock = threading.Lock()
+
+        if session is None:
+            session = requests.Session()
+
+            # Reuse connections across concurrent requests and retry transient failures
+            adapter = HTTPAdapter(
+                pool_connections=self.POOL_SIZE,
+                pool_maxsize=self.POOL_SIZE,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[502, 503, 504],
+                    allowed_methods=["GET", "POST"],
+                    raise_on_status=False,
+                ),
+            )
+            session.mount("https://", adapter)
+
+        self.session = session
 
         if self.token:
             self.session.headers["Authorization"] = f"token {self.token}"
@@ -63,9 +170,12 @@ class GitHubClient:
         self.session.headers["Accept"] = "application/vnd.github.v3+json"
 
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def parse_org_name(url: str) -> str:
         """Parse organization name from a GitHub URL.
 
+        Results are cached, so repeated calls with the same URL are a lookup.
+
         Args:
             url: GitHub organization URL (e.g., https://github.com/openai).
 
@@ -87,33 +197,46 @@ class GitHubClient:
         if not url.startswith(("http://", "https://")):
             url = f"https://{url}"
 
-        parsed = urlparse(url)
-
-        # Check if it's a GitHub URL
-        if parsed.netloc not in ("github.com", "www.github.com"):
+        # Check if it's a GitHub URL and take the first path component as org name,
+        # ignoring tabs and newlines and any ";params" on the last segment like urlparse
+        match = _GITHUB_URL_RE.match(url.translate(_URL_UNSAFE_CHARS))
+        if match is None:
             raise ValueError(f"Invalid GitHub URL: {url}")
 
-        # Extract path components
-        path = parsed.path.strip("/")
-        parts = path.split("/")
-
-        if not parts or not parts[0]:
+        org_name = match["org"] if match["rest"] else match["org"].partition(";")[0]
+        if not org_name:
             raise ValueError(f"No organization name found in URL: {url}")
 
-        # Return the first path component as org name
-        org_name = parts[0]
-
         # Validate org name format (GitHub username/org rules)
-        if not re.match(r"^[a-zA-Z0-9]([a-zA-Z0-9-]*[a-zA-Z0-9])?$", org_name):
+        if not _ORG_NAME_RE.match(org_name):
             raise ValueError(f"Invalid organization name format: {org_name}")
 
         return org_name
 
-    def list_org_repositories(self, org_name: str) -> list[Repository]:
+    def list_org_repositories(
+        self,
+        org_name: str,
+        use_cache: bool = True,
+        include_forks: bool = True,
+        include_archived: bool = True,
+        include_private: bool = True,
+    ) -> list[Repository]:
         """List all repositories for a GitHub organization.
 
+        Uses the GraphQL API when a token is configured, since it returns only
+        the fields we need, can filter repositories server-side, and GraphQL
+        requires authentication. Falls back to the REST API for anonymous
+        access, filtering the results locally.
+
+        When a cache directory is configured, a recently fetched list is
+        returned without contacting the API, and fresh results are cached.
+
         Args:
             org_name: Name of the GitHub organization.
+            use_cache: If False, ignore any cached list (results are still cached).
+            include_forks: If False, leave out forked repositories.
+            include_archived: If False, leave out archived repositories.
+            include_private: If False, leave out private repositories.
 
         Returns:
             List of Repository objects.
@@ -123,72 +246,409 @@ class GitHubClient:
             RateLimitError: If API rate limit is exceeded.
             GitHubAPIError: For other API errors.
         """
+        # Private repos are only listed for authenticated clients
+        cache_key = f"{org_name.lower()}-{'token' if self.token else 'anonymous'}"
+        excluded = [
+            kind
+            for kind, included in (
+                ("forks", include_forks),
+                ("archived", include_archived),
+                ("private", include_private),
+            )
+            if not included
+        ]
+        if excluded:
+            cache_key += f"-no-{'-'.join(excluded)}"
+
+        if self.cache_dir and use_cache:
+            cached = cache.get(self.cache_dir, cache_key)
+            if cached is not None:
+                try:
+                    return [Repository(**repo_data) for repo_data in cached]
+                except TypeError:
+                    pass  # Written by an older version, refetch
+
+        if self.token:
+            repositories = self._list_org_repositories_graphql(
+                org_name, include_forks, include_archived, include_private
+            )
+        else:
+            repositories = [
+                repo
+                for repo in self._list_org_repositories_rest(org_name)
+                if (include_forks or not repo.fork)
+                and (include_archived or not repo.archived)
+                and (include_private or not repo.private)
+            ]
+
+        if self.cache_dir:
+            cache.put(self.cache_dir, cache_key, [asdict(repo) for repo in repositories])
+
+        return repositories
+
+    def _list_org_repositories_graphql(
+        self,
+        org_name: str,
+        include_forks: bool = True,
+        include_archived: bool = True,
+        include_private: bool = True,
+    ) -> list[Repository]:
+        """List organization repositories using the GraphQL API.
+
+        Args:
+            org_name: Name of the GitHub organization.
+            include_forks: If False, ask the API to leave out forks.
+            include_archived: If False, ask the API to leave out archived repositories.
+            include_private: If False, ask the API for public repositories only.
+
+        Returns:
+            List of Repository objects.
+        """
         repositories = []
-        page = 1
+        cursor: str | None = None
 
         while True:
-            url = f"{self.BASE_URL}/orgs/{org_name}/repos"
-            params: dict[str, str | int] = {
-                "per_page": self.PER_PAGE,
-                "page": page,
-                "type": "all",  # Include all repo types
+            payload = {
+                "query": self.REPOSITORIES_QUERY,
+                "variables": {
+                    "login": org_name,
+                    "cursor": cursor,
+                    # A null filter matches every repository
+                    "isFork": None if include_forks else False,
+                    "isArchived": None if include_archived else False,
+                    "privacy": None if include_private else "PUBLIC",
+                },
             }
 
-            try:
-                response = self.session.get(url, params=params, timeout=30)
-            except requests.RequestException as e:
-                raise GitHubAPIError(f"Failed to fetch repositories: {e}") from e
+            response = self._request("POST", self.GRAPHQL_URL, json=payload)
+            self._check_response(response, org_name)
 
-            # Handle specific status codes
-            if response.status_code == 404:
-                raise OrganizationNotFoundError(
-                    f"Organization '{org_name}' not found. "
-                    "Please check the organization name and try again."
-                )
-            elif response.status_code == 403:
-                # Check if it's a rate limit error
-                if "rate limit" in response.text.lower():
-                    reset_time = response.headers.get("X-RateLimit-Reset", "unknown")
-                    raise RateLimitError(
-                        f"GitHub API rate limit exceeded. "
-                        f"Rate limit resets at: {reset_time}. "
-                        "Consider providing a GitHub token for higher limits."
-                    )
-                else:
-                    raise GitHubAPIError(f"Access forbidden (403): {response.text}")
-            elif response.status_code != 200:
-                raise GitHubAPIError(
-                    f"GitHub API request failed with status {response.status_code}: "
-                    f"{response.text}"
-                )
-
-            # Parse response
             try:
-                repos_data = response.json()
+                result = _json_loads(response.content)
             except ValueError as e:
                 raise GitHubAPIError(f"Failed to parse API response: {e}") from e
 
-            # If no repos returned, we've reached the end
-            if not repos_data:
-                break
+            # GraphQL reports most failures in the body with a 200 status
+            errors = result.get("errors") or []
+            error_types = {error.get("type") for error in errors}
+            if "NOT_FOUND" in error_types:
+                raise self._not_found_error(org_name)
+            elif "RATE_LIMITED" in error_types:
+                raise RateLimitError(
+                    "GitHub API rate limit exceeded. "
+                    "Wait for the rate limit to reset and try again."
+                )
+            elif errors:
+                messages = "; ".join(error.get("message", "unknown error") for error in errors)
+                raise GitHubAPIError(f"GitHub GraphQL query failed: {messages}")
+
+            organization = (result.get("data") or {}).get("organization")
+            if organization is None:
+                raise self._not_found_error(org_name)
 
-            # Convert to Repository objects
-            for repo_data in repos_data:
+            connection = organization["repositories"]
+            for node in connection["nodes"]:
                 repositories.append(
                     Repository(
-                        name=repo_data["name"],
-                        clone_url=repo_data["clone_url"],
-                        ssh_url=repo_data["ssh_url"],
-                        description=repo_data.get("description"),
+                        name=node["name"],
+                        clone_url=f"{node['url']}.git",
+                        ssh_url=node["sshUrl"],
+                        description=node.get("description"),
+                        fork=node.get("isFork", False),
+                        archived=node.get("isArchived", False),
+                        private=node.get("isPrivate", False),
                     )
                 )
 
-            # Check if there are more pages
-            # GitHub uses Link header for pagination
-            link_header = response.headers.get("Link", "")
-            if 'rel="next"' not in link_header:
+            page_info = connection["pageInfo"]
+            if not page_info["hasNextPage"]:
                 break
 
-            page += 1
+            cursor = page_info["endCursor"]
 
         return repositories
+
+    def _list_org_repositories_rest(self, org_name: str) -> list[Repository]:
+        """List organization repositories using the paginated REST API.
+
+        Args:
+            org_name: Name of the GitHub organization.
+
+        Returns:
+            List of Repository objects.
+        """
+        repos_data, links = self._fetch_repos_page(org_name, 1)
+        repositories = self._repositories_from_page(repos_data)
+
+        last_page = self._last_page(links)
+        if last_page is not None and last_page > 1 and self._can_fetch_concurrently(last_page - 1):
+            # The Link header tells us how many pages exist, so fetch the rest
+            # concurrently; each worker also builds its page's Repository objects
+            # so that work overlaps with the other downloads
+            max_workers = min(self.MAX_PAGE_WORKERS, last_page - 1)
+
+            # The shared pool may be larger, so bound the requests in flight here
+            slots = threading.BoundedSemaphore(max_workers)
+
+            def fetch_with_slot(page: int) -> list[Repository]:
+                with slots:
+                    return self._repositories_from_page(self._fetch_repos_page(org_name, page)[0])
+
+            executor = get_pool(max_workers)
+            for page_repositories in executor.map(fetch_with_slot, range(2, last_page + 1)):
+                repositories.extend(page_repositories)
+        elif last_page is not None and last_page > 1:
+            # Too little rate limit budget to request every page at once, so fetch
+            # them one at a time, letting each request wait for the reset if needed
+            for page in range(2, last_page + 1):
+                repos_data, _ = self._fetch_repos_page(org_name, page)
+                repositories.extend(self._repositories_from_page(repos_data))
+        else:
+            # Otherwise follow rel="next" links until no repos are returned
+            page = 1
+            while repos_data and "next" in links:
+                page += 1
+                repos_data, links = self._fetch_repos_page(org_name, page)
+                repositories.extend(self._repositories_from_page(repos_data))
+
+        return repositories
+
+    def _can_fetch_concurrently(self, pages: int) -> bool:
+        """Check whether the rate limit budget covers fetching pages all at once.
+
+        Concurrent requests are all sent before any of them reports its
+        remaining budget, so they can't be throttled individually.
+
+        Args:
+            pages: Number of page requests that would be sent concurrently.
+
+        Returns:
+            True if at least ``RATE_LIMIT_THRESHOLD`` requests would remain
+            afterwards, or if no budget has been reported.
+        """
+        with self._rate_limit_lock:
+            if self._rate_limit is None:
+                return True
+            remaining = self._rate_limit[0]
+
+        return remaining - pages >= self.RATE_LIMIT_THRESHOLD
+
+    @staticmethod
+    def _repositories_from_page(repos_data: list[dict[str, Any]]) -> list[Repository]:
+        """Convert one page of REST repository objects to Repository objects.
+
+        Args:
+            repos_data: Repository JSON objects from a single API page.
+
+        Returns:
+            List of Repository objects.
+        """
+        return [
+            Repository(
+                name=repo_data["name"],
+                clone_url=repo_data["clone_url"],
+                ssh_url=repo_data["ssh_url"],
+                description=repo_data.get("description"),
+                fork=repo_data.get("fork", False),
+                archived=repo_data.get("archived", False),
+                private=repo_data.get("private", False),
+            )
+            for repo_data in repos_data
+        ]
+
+    def _fetch_repos_page(
+        self, org_name: str, page: int
+    ) -> tuple[list[dict[str, Any]], dict[str, dict[str, str]]]:
+        """Fetch a single page of organization repositories from the REST API.
+
+        When caching is enabled, the request is made conditional on the cached
+        ETag and/or Last-Modified date so unchanged pages are served from disk
+        on a 304 response.
+
+        Args:
+            org_name: Name of the GitHub organization.
+            page: Page number to fetch (1-based).
+
+        Returns:
+            A tuple of (repository JSON objects, parsed Link header).
+        """
+        url = f"{self.BASE_URL}/orgs/{org_name}/repos"
+        params: dict[str, str | int] = {
+            "per_page": self.PER_PAGE,
+            "page": page,
+            "type": "all",  # Include all repo types
+        }
+        cache_key = f"{url}?{urlencode(params)}"
+
+        cached = cache.load_page(self.cache_dir, cache_key) if self.cache_dir else None
+        headers: dict[str, str] = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self._request("GET", url, params=params, headers=headers)
+
+        if response.status_code == 304 and cached:
+            return cached["data"], cached["links"]
+
+        self._check_response(response, org_name)
+
+        # Parse response
+        try:
+            repos_data = _json_loads(response.content)
+        except ValueError as e:
+            raise GitHubAPIError(f"Failed to parse API response: {e}") from e
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if self.cache_dir and (etag or last_modified):
+            cache.store_page(
+                self.cache_dir, cache_key, etag, repos_data, response.links, last_modified
+            )
+
+        return repos_data, response.links
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send an API request, staying within GitHub's rate limits.
+
+        Secondary rate limit responses (429, or 403 with ``Retry-After``) are
+        retried with exponential backoff. When the previous response reported
+        that fewer than ``RATE_LIMIT_THRESHOLD`` requests remain, this waits
+        for the limit to reset before sending, so no time is spent waiting
+        after the last request or before an error is raised.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Extra arguments passed to ``Session.request``.
+
+        Returns:
+            The final response, which may still be an error response.
+
+        Raises:
+            GitHubAPIError: If the request could not be sent.
+        """
+        self._throttle()
+
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            try:
+                response = self.session.request(method, url, timeout=30, **kwargs)
+            except requests.RequestException as e:
+                raise GitHubAPIError(f"Failed to fetch repositories: {e}") from e
+
+            retry_after = response.headers.get("Retry-After")
+            is_secondary_limit = response.status_code == 429 or (
+                response.status_code == 403 and retry_after is not None
+            )
+            if not is_secondary_limit or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                break
+
+            delay = int(retry_after) if retry_after and retry_after.isdigit() else 2**attempt
+            logger.warning(f"Secondary rate limit hit, retrying in {delay}s...")
+            time.sleep(delay)
+
+        self._record_rate_limit(response)
+        return response
+
+    def _record_rate_limit(self, response: requests.Response) -> None:
+        """Remember the rate limit budget reported by a response.
+
+        Concurrent responses may arrive out of order, so within one rate limit
+        window only the lowest remaining count is kept.
+
+        Args:
+            response: Response whose rate limit headers should be checked.
+        """
+        remaining = response.headers.get("X-RateLimit-Remaining", "")
+        reset = response.headers.get("X-RateLimit-Reset", "")
+        if not (remaining.isdigit() and reset.isdigit()):
+            return
+
+        with self._rate_limit_lock:
+            if (
+                self._rate_limit is None
+                or int(reset) > self._rate_limit[1]
+                or int(remaining) < self._rate_limit[0]
+            ):
+                self._rate_limit = (int(remaining), int(reset))
+
+    def _throttle(self) -> None:
+        """Wait for the rate limit to reset if the last response left it nearly spent."""
+        with self._rate_limit_lock:
+            if self._rate_limit is None:
+                return
+            remaining, reset = self._rate_limit
+
+        if remaining >= self.RATE_LIMIT_THRESHOLD:
+            return
+
+        delay = reset - time.time()
+        if delay > 0:
+            logger.warning(
+                f"GitHub API rate limit nearly exhausted ({remaining} requests left), "
+                f"waiting {delay:.0f}s for it to reset..."
+            )
+            time.sleep(delay)
+
+    @staticmethod
+    def _last_page(links: dict[str, dict[str, str]]) -> int | None:
+        """Extract the last page number from a parsed Link header.
+
+        Args:
+            links: Parsed Link header (``response.links``).
+
+        Returns:
+            The last page number, or None if the header has no usable rel="last" link.
+        """
+        last_url = links.get("last", {}).get("url")
+        if not last_url:
+            return None
+
+        page_values = parse_qs(urlparse(last_url).query).get("page")
+        if not page_values or not page_values[0].isdigit():
+            return None
+
+        return int(page_values[0])
+
+    def _check_response(self, response: requests.Response, org_name: str) -> None:
+        """Raise the appropriate exception for an unsuccessful API response.
+
+        Args:
+            response: Response returned by the GitHub API.
+            org_name: Name of the organization being queried.
+
+        Raises:
+            OrganizationNotFoundError: If the organization doesn't exist.
+            RateLimitError: If API rate limit is exceeded.
+            GitHubAPIError: For any other non-200 response.
+        """
+        if response.status_code == 404:
+            raise self._not_found_error(org_name)
+        elif response.status_code in (403, 429):
+            # Rate limiting is reported in the headers, so the body needn't be decoded
+            if (
+                response.status_code == 429
+                or response.headers.get("X-RateLimit-Remaining") == "0"
+                or "Retry-After" in response.headers
+            ):
+                reset_time = response.headers.get("X-RateLimit-Reset", "unknown")
+                raise RateLimitError(
+                    f"GitHub API rate limit exceeded. "
+                    f"Rate limit resets at: {reset_time}. "
+                    "Consider providing a GitHub token for higher limits."
+                )
+            else:
+                raise GitHubAPIError(f"Access forbidden (403): {response.text}")
+        elif response.status_code != 200:
+            raise GitHubAPIError(
+                f"GitHub API request failed with status {response.status_code}: {response.text}"
+            )
+
+    @staticmethod
+    def _not_found_error(org_name: str) -> OrganizationNotFoundError:
+        """Build the error raised when an organization does not exist."""
+        return OrganizationNotFoundError(
+            f"Organization '{org_name}' not found. "
+            "Please check the organization name and try again."
+        )
@@ -0,0 +1,54 @@
+"""Shared thread pool for concurrent API requests, clones and setup checks."""
+
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_pool: ThreadPoolExecutor | None = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def get_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Return the shared thread pool, creating it on first use.
+
+    The pool is grown (replaced by a larger one) when more workers are
+    requested than it currently has, so it may have more threads than asked
+    for. Callers that need a strict concurrency limit should bound their own
+    tasks, e.g. with a semaphore.
+
+    Args:
+        max_workers: Minimum number of worker threads required.
+
+    Returns:
+        The shared ThreadPoolExecutor.
+    """
+    global _pool, _pool_size
+
+    with _pool_lock:
+        if _pool is None or _pool_size < max_workers:
+            if _pool is not None:
+                # Tasks already submitted to the old pool still run to completion
+                _pool.shutdown(wait=False)
+
+            _pool = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="github-org-cloner",
+            )
+            _pool_size = max_workers
+
+        return _pool
+
+
+def shutdown() -> None:
+    """Shut down the shared thread pool, waiting for running tasks."""
+    global _pool, _pool_size
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+            _pool_size = 0
+
+
+atexit.register(shutdown)
@@ -1,11 +1,169 @@
 """Post-clone setup runner for repositories."""
 
+import atexit
 import logging
+import os
+import secrets
+import shlex
+import signal
 import subprocess
+import threading
+from concurrent.futures import as_completed
 from pathlib import Path
 
+from .pool import get_pool
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of repositories checked concurrently
+MAX_SETUP_WORKERS = 8
+
+# Maximum time a setup script may run, in seconds
+SETUP_TIMEOUT = 300
+
+# Keeps each repository's buffered messages together when checked in parallel
+_log_lock = threading.Lock()
+
+# One long-running bash per worker thread, so running a setup script forks the
+# small shell rather than the Python process
+_local = threading.local()
+_shells: list[subprocess.Popen[str]] = []
+_shells_lock = threading.Lock()
+
+# Printed after each script so the end of its output can be found
+_SENTINEL = "__GITHUB_ORG_CLONER_SETUP_DONE__"
+
+
+def _get_shell() -> subprocess.Popen[str]:
+    """Return this thread's persistent bash process, starting it if needed."""
+    shell: subprocess.Popen[str] | None = getattr(_local, "shell", None)
+    if shell is None or shell.poll() is not None:
+        shell = subprocess.Popen(
+            ["bash", "--noprofile", "--norc", "-s"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            # Own process group, so a timeout also kills the running script
+            start_new_session=True,
+        )
+        _local.shell = shell
+        with _shells_lock:
+            _shells.append(shell)
+
+    return shell
+
+
+def _kill_shell(shell: subprocess.Popen[str]) -> None:
+    """Kill a persistent shell along with any script it is running."""
+    try:
+        os.killpg(shell.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _close_shells() -> None:
+    """Stop all persistent shells."""
+    with _shells_lock:
+        for shell in _shells:
+            if shell.poll() is None and shell.stdin:
+                shell.stdin.close()
+                try:
+                    shell.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    _kill_shell(shell)
+        _shells.clear()
+
+
+atexit.register(_close_shells)
+
+
+def _run_setup_script(repo_path: Path) -> str:
+    """Run a repository's setup.sh and return its combined output.
+
+    The script runs as ``bash setup.sh`` from the thread's persistent shell.
+    If that shell can't be used (process groups aren't supported, or it fails
+    to start), a fresh ``bash`` process is spawned for the script instead.
+
+    Args:
+        repo_path: Path to the repository containing setup.sh.
+
+    Returns:
+        The script's output.
+
+    Raises:
+        subprocess.CalledProcessError: If the script exits with a non-zero status.
+        subprocess.TimeoutExpired: If the script runs longer than SETUP_TIMEOUT.
+    """
+    cmd = ["bash", "setup.sh"]
+
+    shell = None
+    if hasattr(os, "killpg"):
+        try:
+            shell = _get_shell()
+        except OSError as e:
+            logger.debug(f"Could not start persistent shell, running setup.sh directly: {e}")
+
+    if shell is None:
+        # Mirror the persistent shell: stdin closed, stdout and stderr combined
+        try:
+            result = subprocess.run(
+                cmd,
+                cwd=repo_path,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                timeout=SETUP_TIMEOUT,
+                check=True,
+            )
+        except subprocess.CalledProcessError as e:
+            e.stderr = e.output
+            raise
+        return result.stdout
+
+    assert shell.stdin is not None and shell.stdout is not None
+
+    # The leading newline ensures the sentinel starts its own line
+    token = f"{_SENTINEL}{secrets.token_hex(8)}"
+    command = (
+        f"cd -- {shlex.quote(str(repo_path))} && bash setup.sh </dev/null 2>&1\n"
+        f"printf '\\n%s %d\\n' {token} $?\n"
+    )
+
+    timer = threading.Timer(SETUP_TIMEOUT, _kill_shell, args=(shell,))
+    lines: list[str] = []
+    status: int | None = None
+
+    timer.start()
+    try:
+        shell.stdin.write(command)
+        shell.stdin.flush()
+
+        for line in shell.stdout:
+            if line.startswith(token):
+                status = int(line.split()[1])
+                break
+            lines.append(line)
+    except BrokenPipeError:
+        pass  # The shell has exited; handled below
+    finally:
+        timer.cancel()
+
+    output = "".join(lines).removesuffix("\n")
+
+    if status is None:
+        # The shell exited: either it was killed on timeout or it died
+        _local.shell = None
+        if shell.wait() == -signal.SIGKILL:
+            raise subprocess.TimeoutExpired(cmd, SETUP_TIMEOUT, output=output)
+        raise subprocess.CalledProcessError(-1, cmd, output=output, stderr=output)
+
+    if status != 0:
+        raise subprocess.CalledProcessError(status, cmd, output=output, stderr=output)
+
+    return output
+
 
 def run_optional_setup(repo_path: Path, auto_run: bool = False) -> None:
     """Run optional setup steps for a cloned repository.
@@ -18,93 +176,91 @@ def run_optional_setup(repo_path: Path, auto_run: bool = False) -> None:
         auto_run: If True, automatically run setup scripts when found.
                   If False, only provide suggestions.
     """
-    if not repo_path.exists() or not repo_path.is_dir():
+    # List the directory once instead of checking each marker file separately
+    try:
+        names = {entry.name for entry in os.scandir(repo_path)}
+    except OSError:
         logger.warning(f"Repository path does not exist: {repo_path}")
         return
 
-    logger.info(f"Checking for setup options in {repo_path.name}")
+    # Buffer messages, with their log levels, so they aren't interleaved with
+    # other repositories' output
+    messages: list[tuple[int, str]] = []
+
+    def note(message: str, level: int = logging.INFO) -> None:
+        messages.append((level, message))
+
+    note(f"Checking for setup options in {repo_path.name}")
 
     # Check for setup.sh script
-    setup_script = repo_path / "setup.sh"
-    if setup_script.exists():
+    if "setup.sh" in names:
         if auto_run:
-            logger.info(f"Found setup.sh in {repo_path.name}, running it...")
+            note(f"Found setup.sh in {repo_path.name}, running it...")
             try:
-                result = subprocess.run(
-                    ["bash", str(setup_script)],
-                    cwd=repo_path,
-                    capture_output=True,
-                    text=True,
-                    timeout=300,  # 5 minute timeout
-                    check=True,
-                )
-                logger.info(f"Setup script completed successfully for {repo_path.name}")
-                if result.stdout:
-                    logger.debug(f"Setup output: {result.stdout}")
+                output = _run_setup_script(repo_path)
+                note(f"Setup script completed successfully for {repo_path.name}")
+                if output:
+                    note(f"Setup output: {output}", logging.DEBUG)
             except subprocess.CalledProcessError as e:
-                logger.error(f"Setup script failed for {repo_path.name}: {e.stderr}")
+                note(f"Setup script failed for {repo_path.name}: {e.stderr}", logging.ERROR)
             except subprocess.TimeoutExpired:
-                logger.error(f"Setup script timeout for {repo_path.name} (exceeded 5 minutes)")
+                note(
+                    f"Setup script timeout for {repo_path.name} (exceeded 5 minutes)",
+                    logging.ERROR,
+                )
         else:
-            logger.info(
+            note(
                 f"  Found setup.sh in {repo_path.name}. " "Run it manually or use --run-setup flag."
             )
 
     # Check for Node.js project
-    package_json = repo_path / "package.json"
-    if package_json.exists():
-        logger.info(
+    if "package.json" in names:
+        note(
             f"  Detected Node.js project in {repo_path.name}. "
             "You may want to run 'npm install' or 'yarn install'."
         )
 
     # Check for Python project
-    pyproject_toml = repo_path / "pyproject.toml"
-    requirements_txt = repo_path / "requirements.txt"
-    setup_py = repo_path / "setup.py"
-
-    if pyproject_toml.exists() or requirements_txt.exists() or setup_py.exists():
-        logger.info(
+    if names & {"pyproject.toml", "requirements.txt", "setup.py"}:
+        note(
             f"  Detected Python project in {repo_path.name}. "
             "You may want to create a virtual environment and install dependencies:"
         )
-        if pyproject_toml.exists():
-            logger.info("    python -m venv venv && source venv/bin/activate && pip install -e .")
-        elif requirements_txt.exists():
-            logger.info(
+        if "pyproject.toml" in names:
+            note("    python -m venv venv && source venv/bin/activate && pip install -e .")
+        elif "requirements.txt" in names:
+            note(
                 "    python -m venv venv && source venv/bin/activate && "
                 "pip install -r requirements.txt"
             )
 
     # Check for Ruby project
-    gemfile = repo_path / "Gemfile"
-    if gemfile.exists():
-        logger.info(
+    if "Gemfile" in names:
+        note(
             f"  Detected Ruby project in {repo_path.name}. " "You may want to run 'bundle install'."
         )
 
     # Check for Go project
-    go_mod = repo_path / "go.mod"
-    if go_mod.exists():
-        logger.info(
+    if "go.mod" in names:
+        note(
             f"  Detected Go project in {repo_path.name}. " "You may want to run 'go mod download'."
         )
 
     # Check for Rust project
-    cargo_toml = repo_path / "Cargo.toml"
-    if cargo_toml.exists():
-        logger.info(
-            f"  Detected Rust project in {repo_path.name}. " "You may want to run 'cargo build'."
-        )
+    if "Cargo.toml" in names:
+        note(f"  Detected Rust project in {repo_path.name}. " "You may want to run 'cargo build'.")
 
     # Check for Makefile
-    makefile = repo_path / "Makefile"
-    if makefile.exists():
-        logger.info(
+    if "Makefile" in names:
+        note(
             f"  Found Makefile in {repo_path.name}. "
             "You may want to check 'make help' or run 'make'."
         )
 
+    with _log_lock:
+        for level, message in messages:
+            logger.log(level, message)
+
 
 def run_setup_for_all(
     repo_paths: list[Path],
@@ -112,6 +268,9 @@ def run_setup_for_all(
 ) -> None:
     """Run setup checks for multiple repositories.
 
+    Repositories are checked concurrently since the work is dominated by
+    filesystem access and setup script execution.
+
     Args:
         repo_paths: List of repository paths to check.
         auto_run: If True, automatically run setup scripts when found.
@@ -121,5 +280,17 @@ def run_setup_for_all(
 
     logger.info(f"\nChecking setup options for {len(repo_paths)} repositories...")
 
-    for repo_path in repo_paths:
-        run_optional_setup(repo_path, auto_run)
+    max_workers = min(MAX_SETUP_WORKERS, len(repo_paths))
+    executor = get_pool(max_workers)
+
+    # The shared pool may be larger, so bound the checks in flight here
+    slots = threading.BoundedSemaphore(max_workers)
+
+    def setup_with_slot(repo_path: Path) -> None:
+        with slots:
+            run_optional_setup(repo_path, auto_run)
+
+    futures = [executor.submit(setup_with_slot, repo_path) for repo_path in repo_paths]
+
+    for future in as_completed(futures):
+        future.result()
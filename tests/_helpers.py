@@ -0,0 +1,23 @@
+"""Shared helpers for the test suite."""
+
+import sys
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+
+
+@contextmanager
+def patched_argv(argv: Sequence[str]) -> Iterator[None]:
+    """Temporarily replace sys.argv with the given command line.
+
+    Args:
+        argv: Command line to install, including the program name.
+
+    Yields:
+        None, with sys.argv set for the duration of the block.
+    """
+    old_argv = sys.argv
+    sys.argv = list(argv)
+    try:
+        yield
+    finally:
+        sys.argv = old_argv
@@ -0,0 +1,62 @@
+"""Shared pytest fixtures."""
+
+import argparse
+import subprocess
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from github_org_cloner.cli import _build_parser
+from github_org_cloner.github_client import GitHubClient, Repository
+
+
+@pytest.fixture(scope="session")
+def parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser once for the whole test session."""
+    return _build_parser()
+
+
+@pytest.fixture(scope="session")
+def gh_client_token() -> GitHubClient:
+    """Build an authenticated client once; it has no cache, so tests can share it."""
+    return GitHubClient(token="test_token_123")
+
+
+@pytest.fixture(scope="session")
+def sample_repo() -> Repository:
+    """Create a sample repository for testing (shared, do not mutate)."""
+    return Repository(
+        name="test-repo",
+        clone_url="https://github.com/testorg/test-repo.git",
+        ssh_url="git@github.com:testorg/test-repo.git",
+        description="A test repository",
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_repos() -> list[Repository]:
+    """Create a list of sample repositories for testing (shared, do not mutate)."""
+    return [
+        Repository(
+            name=f"repo{i}",
+            clone_url=f"https://github.com/testorg/repo{i}.git",
+            ssh_url=f"git@github.com:testorg/repo{i}.git",
+            description=f"Repo {i}",
+        )
+        for i in range(1, 4)
+    ]
+
+
+@pytest.fixture(scope="session")
+def success_run_result() -> subprocess.CompletedProcess[str]:
+    """Result of a successful subprocess.run call, shared across tests."""
+    return subprocess.CompletedProcess(args=["git"], returncode=0, stdout="", stderr="")
+
+
+@pytest.fixture
+def fake_session() -> MagicMock:
+    """Create a mock requests session to inject into GitHubClient."""
+    session = MagicMock(spec=requests.Session)
+    session.headers = {}
+    return session
@@ -0,0 +1,69 @@
+"""Tests for the on-disk API response cache."""
+
+import os
+import time
+from pathlib import Path
+
+from github_org_cloner import cache
+
+
+class TestRepositoryListCache:
+    """Tests for caching repository lists."""
+
+    def test_put_and_get(self, tmp_path: Path) -> None:
+        """Test that a stored repository list is returned while fresh."""
+        repos = [{"name": "repo1", "clone_url": "url", "ssh_url": "ssh", "description": None}]
+
+        cache.put(tmp_path, "testorg", repos)
+
+        assert cache.get(tmp_path, "testorg") == repos
+
+    def test_get_missing(self, tmp_path: Path) -> None:
+        """Test that a missing cache entry returns None."""
+        assert cache.get(tmp_path, "testorg") is None
+
+    def test_get_expired(self, tmp_path: Path) -> None:
+        """Test that entries older than the TTL are ignored."""
+        cache.put(tmp_path, "testorg", [])
+        old = time.time() - cache.REPOS_TTL - 1
+        os.utime(tmp_path / "testorg.json", (old, old))
+
+        assert cache.get(tmp_path, "testorg") is None
+
+    def test_get_corrupt(self, tmp_path: Path) -> None:
+        """Test that unreadable cache files are treated as a miss."""
+        (tmp_path / "testorg.json").write_text("not json")
+
+        assert cache.get(tmp_path, "testorg") is None
+
+
+class TestPageCache:
+    """Tests for caching API pages by ETag and Last-Modified date."""
+
+    def test_store_and_load_page(self, tmp_path: Path) -> None:
+        """Test that a stored page round-trips with its ETag and links."""
+        links = {"next": {"url": "https://api.github.com/next", "rel": "next"}}
+
+        cache.store_page(tmp_path, "key", '"etag"', [{"name": "repo1"}], links)
+
+        assert cache.load_page(tmp_path, "key") == {
+            "etag": '"etag"',
+            "last_modified": None,
+            "data": [{"name": "repo1"}],
+            "links": links,
+        }
+
+    def test_store_page_last_modified(self, tmp_path: Path) -> None:
+        """Test that a page can be cached by its Last-Modified date alone."""
+        modified = "Wed, 14 Oct 2026 12:00:00 GMT"
+
+        cache.store_page(tmp_path, "key", None, [], {}, last_modified=modified)
+
+        entry = cache.load_page(tmp_path, "key")
+        assert entry is not None
+        assert entry["etag"] is None
+        assert entry["last_modified"] == modified
+
+    def test_load_missing_page(self, tmp_path: Path) -> None:
+        """Test that a missing page returns None."""
+        assert cache.load_page(tmp_path, "key") is None
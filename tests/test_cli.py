@@ -1,86 +1,185 @@
 """Tests for the command-line interface."""
 
+import argparse
+import logging
+import logging.handlers
 import sys
+from dataclasses import dataclass
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from github_org_cloner.cli import get_github_token, get_org_url, main, parse_args
-from github_org_cloner.github_client import OrganizationNotFoundError, RateLimitError
+from github_org_cloner.cli import (
+    get_github_token,
+    get_org_url,
+    main,
+    parse_args,
+    setup_logging,
+)
+from github_org_cloner.github_client import (
+    OrganizationNotFoundError,
+    RateLimitError,
+    Repository,
+)
+from tests._helpers import patched_argv
+
+# Command line shared by the main() tests
+ARGV_TESTORG = ("prog", "https://github.com/testorg")
+
+
+@pytest.fixture(autouse=True)
+def no_prewarm_dns(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Keep main() from resolving hosts during tests."""
+    mock_prewarm = MagicMock()
+    monkeypatch.setattr("github_org_cloner.cli.prewarm_dns", mock_prewarm)
+    return mock_prewarm
+
+
+class TestSetupLogging:
+    """Tests for logging configuration."""
+
+    def test_setup_logging_uses_queue(self) -> None:
+        """Test that records go through a queue to a background listener."""
+        root = logging.getLogger()
+
+        with (
+            patch.object(root, "handlers", []),
+            patch.object(root, "level", root.level),
+            patch("github_org_cloner.cli.atexit.register") as mock_register,
+        ):
+            setup_logging(verbose=True)
+
+            assert len(root.handlers) == 1
+            assert isinstance(root.handlers[0], logging.handlers.QueueHandler)
+            assert root.level == logging.DEBUG
+
+            # Stop the listener thread registered for exit
+            stop_listener = mock_register.call_args.args[0]
+            stop_listener()
+
+    def test_setup_logging_writes_through_tqdm(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that records are written with tqdm.write when tqdm is installed."""
+        fake_tqdm = MagicMock()
+        monkeypatch.setitem(sys.modules, "tqdm", fake_tqdm)
+        root = logging.getLogger()
+
+        with (
+            patch.object(root, "handlers", []),
+            patch.object(root, "level", root.level),
+            patch("github_org_cloner.cli.atexit.register") as mock_register,
+        ):
+            setup_logging()
+
+            stop_listener = mock_register.call_args.args[0]
+            (handler,) = stop_listener.__self__.handlers
+            handler.handle(logging.makeLogRecord({"msg": "hello", "levelname": "INFO"}))
+            stop_listener()
+
+        fake_tqdm.tqdm.write.assert_called_once_with("INFO: hello", file=handler.stream)
+
+    def test_setup_logging_keeps_existing_handlers(self) -> None:
+        """Test that existing logging configuration is left alone."""
+        root = logging.getLogger()
+        handler = logging.NullHandler()
+
+        with patch.object(root, "handlers", [handler]):
+            setup_logging()
+
+            assert root.handlers == [handler]
 
 
 class TestParseArgs:
     """Tests for command-line argument parsing."""
 
-    def test_parse_args_with_org_url(self) -> None:
-        """Test parsing with organization URL provided."""
-        test_args = ["prog", "https://github.com/openai"]
-        with patch.object(sys, "argv", test_args):
-            args = parse_args()
-            assert args.org_url == "https://github.com/openai"
-
-    def test_parse_args_with_base_dir(self) -> None:
-        """Test parsing with base directory flag."""
-        test_args = ["prog", "--base-dir", "/tmp/repos"]
-        with patch.object(sys, "argv", test_args):
-            args = parse_args()
-            assert args.base_dir == "/tmp/repos"
-
-    def test_parse_args_with_parallel(self) -> None:
-        """Test parsing with parallel flag."""
-        test_args = ["prog", "--parallel"]
-        with patch.object(sys, "argv", test_args):
-            args = parse_args()
-            assert args.parallel is True
-
-    def test_parse_args_with_max_workers(self) -> None:
-        """Test parsing with max workers option."""
-        test_args = ["prog", "--max-workers", "4"]
-        with patch.object(sys, "argv", test_args):
-            args = parse_args()
-            assert args.max_workers == 4
-
-    def test_parse_args_with_run_setup(self) -> None:
-        """Test parsing with run-setup flag."""
-        test_args = ["prog", "--run-setup"]
-        with patch.object(sys, "argv", test_args):
-            args = parse_args()
-            assert args.run_setup is True
-
-    def test_parse_args_with_dry_run(self) -> None:
-        """Test parsing with dry-run flag."""
-        test_args = ["prog", "--dry-run"]
-        with patch.object(sys, "argv", test_args):
-            args = parse_args()
-            assert args.dry_run is True
-
-    def test_parse_args_with_verbose(self) -> None:
-        """Test parsing with verbose flag."""
-        test_args = ["prog", "--verbose"]
-        with patch.object(sys, "argv", test_args):
-            args = parse_args()
-            assert args.verbose is True
-
-    def test_parse_args_combined(self) -> None:
+    @pytest.mark.parametrize(
+        ("argv", "attr", "expected"),
+        [
+            (("https://github.com/openai",), "org_url", "https://github.com/openai"),
+            (("--base-dir", "/tmp/repos"), "base_dir", "/tmp/repos"),
+            (("--parallel",), "parallel", True),
+            (("--max-workers", "4"), "max_workers", 4),
+            (("--run-setup",), "run_setup", True),
+            (("--dry-run",), "dry_run", True),
+            (("--verbose",), "verbose", True),
+            (("--no-cache",), "no_cache", True),
+        ],
+        ids=[
+            "org_url",
+            "base_dir",
+            "parallel",
+            "max_workers",
+            "run_setup",
+            "dry_run",
+            "verbose",
+            "no_cache",
+        ],
+    )
+    def test_parse_args(
+        self,
+        parser: argparse.ArgumentParser,
+        argv: tuple[str, ...],
+        attr: str,
+        expected: object,
+    ) -> None:
+        """Test that each option is parsed into its attribute."""
+        args = parser.parse_args(argv)
+        assert getattr(args, attr) == expected
+
+    def test_parse_args_with_shallow(self, parser: argparse.ArgumentParser) -> None:
+        """Test parsing with shallow clone flags."""
+        args = parser.parse_args(["--shallow", "--depth", "5", "--filter", "tree:0"])
+        assert args.shallow is True
+        assert args.depth == 5
+        assert args.filter_spec == "tree:0"
+
+    def test_parse_args_with_filter_blobs(self, parser: argparse.ArgumentParser) -> None:
+        """Test that --filter-blobs is shorthand for --filter blob:none."""
+        args = parser.parse_args(["--filter-blobs"])
+        assert args.filter_spec == "blob:none"
+
+    def test_parse_args_filter_conflict(self, parser: argparse.ArgumentParser) -> None:
+        """Test that --filter and --filter-blobs can't be combined."""
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--filter", "tree:0", "--filter-blobs"])
+
+    def test_parse_args_repository_filters(self, parser: argparse.ArgumentParser) -> None:
+        """Test that forks and archived repos are skipped and private repos included by default."""
+        args = parser.parse_args([])
+        assert args.skip_forks is True
+        assert args.skip_archived is True
+        assert args.include_private is True
+
+        args = parser.parse_args(["--no-skip-forks", "--no-skip-archived", "--no-include-private"])
+        assert args.skip_forks is False
+        assert args.skip_archived is False
+        assert args.include_private is False
+
+    def test_parse_args_combined(self, parser: argparse.ArgumentParser) -> None:
         """Test parsing with multiple flags combined."""
-        test_args = [
-            "prog",
-            "https://github.com/openai",
-            "--base-dir",
-            "/tmp/repos",
-            "--parallel",
-            "--max-workers",
-            "8",
-            "--run-setup",
-        ]
-        with patch.object(sys, "argv", test_args):
+        args = parser.parse_args(
+            [
+                "https://github.com/openai",
+                "--base-dir",
+                "/tmp/repos",
+                "--parallel",
+                "--max-workers",
+                "8",
+                "--run-setup",
+            ]
+        )
+        assert args.org_url == "https://github.com/openai"
+        assert args.base_dir == "/tmp/repos"
+        assert args.parallel is True
+        assert args.max_workers == 8
+        assert args.run_setup is True
+
+    def test_parse_args_reads_argv(self) -> None:
+        """Test that parse_args reads sys.argv when no arguments are given."""
+        with patched_argv(["prog", "https://github.com/openai", "--dry-run"]):
             args = parse_args()
-            assert args.org_url == "https://github.com/openai"
-            assert args.base_dir == "/tmp/repos"
-            assert args.parallel is True
-            assert args.max_workers == 8
-            assert args.run_setup is True
+        assert args.org_url == "https://github.com/openai"
+        assert args.dry_run is True
 
 
 class TestGetOrgUrl:
@@ -155,230 +254,263 @@ class TestGetGitHubToken:
         assert token is None
 
 
+@dataclass
+class MainMocks:
+    """Mocks standing in for main()'s collaborators."""
+
+    client_class: MagicMock
+    client: MagicMock
+    clone_all: MagicMock
+    setup: MagicMock
+    get_token: MagicMock
+
+
+@pytest.fixture
+def main_mocks(monkeypatch: pytest.MonkeyPatch) -> MainMocks:
+    """Replace the GitHub client, cloner, setup runner and token prompt used by main()."""
+    mocks = MainMocks(
+        client_class=MagicMock(),
+        client=MagicMock(),
+        clone_all=MagicMock(),
+        setup=MagicMock(),
+        get_token=MagicMock(return_value=None),
+    )
+    mocks.client_class.return_value = mocks.client
+
+    monkeypatch.setattr("github_org_cloner.cli.GitHubClient", mocks.client_class)
+    monkeypatch.setattr("github_org_cloner.cli.clone_all_repositories", mocks.clone_all)
+    monkeypatch.setattr("github_org_cloner.cli.run_setup_for_all", mocks.setup)
+    monkeypatch.setattr("github_org_cloner.cli.get_github_token", mocks.get_token)
+    return mocks
+
+
 class TestMainFunction:
     """Tests for main CLI function."""
 
-    @patch("github_org_cloner.cli.get_github_token")
-    @patch("github_org_cloner.cli.clone_all_repositories")
-    @patch("github_org_cloner.cli.GitHubClient")
     def test_main_success(
         self,
-        mock_client_class: MagicMock,
-        mock_clone_all: MagicMock,
-        mock_get_token: MagicMock,
+        main_mocks: MainMocks,
+        sample_repos: list[Repository],
         tmp_path: Path,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test successful execution of main function."""
-        # Setup
         monkeypatch.setenv("GITHUB_ORG_CLONE_BASE_DIR", str(tmp_path))
-        test_args = ["prog", "https://github.com/testorg"]
-
-        # Mock token retrieval
-        mock_get_token.return_value = None
-
-        # Mock GitHub client
-        mock_client = MagicMock()
-        mock_client.parse_org_name.return_value = "testorg"
-        mock_client.list_org_repositories.return_value = [
-            MagicMock(name="repo1"),
-            MagicMock(name="repo2"),
-        ]
-        mock_client_class.return_value = mock_client
-
-        # Mock clone results
-        mock_clone_all.return_value = {
+
+        main_mocks.client.parse_org_name.return_value = "testorg"
+        main_mocks.client.list_org_repositories.return_value = sample_repos[:2]
+        main_mocks.clone_all.return_value = {
             "repo1": (True, None),
             "repo2": (True, None),
         }
 
-        with patch.object(sys, "argv", test_args):
+        with patched_argv(ARGV_TESTORG):
             main()
 
         # Verify client was called
-        mock_client.list_org_repositories.assert_called_once_with("testorg")
-        mock_clone_all.assert_called_once()
+        main_mocks.client.list_org_repositories.assert_called_once_with(
+            "testorg",
+            use_cache=True,
+            include_forks=False,
+            include_archived=False,
+            include_private=True,
+        )
+        main_mocks.clone_all.assert_called_once()
 
-    @patch("github_org_cloner.cli.get_github_token")
-    @patch("github_org_cloner.cli.GitHubClient")
     def test_main_missing_base_dir(
         self,
-        mock_client_class: MagicMock,
-        mock_get_token: MagicMock,
+        main_mocks: MainMocks,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test error when base directory is not configured."""
         monkeypatch.delenv("GITHUB_ORG_CLONE_BASE_DIR", raising=False)
-        test_args = ["prog", "https://github.com/testorg"]
-
-        mock_get_token.return_value = None
 
-        with patch.object(sys, "argv", test_args):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
+        with patched_argv(ARGV_TESTORG), pytest.raises(SystemExit) as exc_info:
+            main()
 
-            assert exc_info.value.code == 1
+        assert exc_info.value.code == 1
 
-    @patch("github_org_cloner.cli.get_github_token")
-    @patch("github_org_cloner.cli.GitHubClient")
     def test_main_org_not_found(
         self,
-        mock_client_class: MagicMock,
-        mock_get_token: MagicMock,
+        main_mocks: MainMocks,
         tmp_path: Path,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test error when organization is not found."""
         monkeypatch.setenv("GITHUB_ORG_CLONE_BASE_DIR", str(tmp_path))
-        test_args = ["prog", "https://github.com/nonexistent"]
-
-        mock_get_token.return_value = None
 
-        # Mock GitHub client to raise OrganizationNotFoundError
-        mock_client = MagicMock()
-        mock_client.parse_org_name.return_value = "nonexistent"
-        mock_client.list_org_repositories.side_effect = OrganizationNotFoundError(
+        main_mocks.client.parse_org_name.return_value = "nonexistent"
+        main_mocks.client.list_org_repositories.side_effect = OrganizationNotFoundError(
             "Organization not found"
         )
-        mock_client_class.return_value = mock_client
 
-        with patch.object(sys, "argv", test_args):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
+        with (
+            patched_argv(["prog", "https://github.com/nonexistent"]),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            main()
 
-            assert exc_info.value.code == 1
+        assert exc_info.value.code == 1
 
-    @patch("github_org_cloner.cli.get_github_token")
-    @patch("github_org_cloner.cli.GitHubClient")
     def test_main_rate_limit(
         self,
-        mock_client_class: MagicMock,
-        mock_get_token: MagicMock,
+        main_mocks: MainMocks,
         tmp_path: Path,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test error when rate limit is exceeded."""
         monkeypatch.setenv("GITHUB_ORG_CLONE_BASE_DIR", str(tmp_path))
-        test_args = ["prog", "https://github.com/testorg"]
 
-        mock_get_token.return_value = None
+        main_mocks.client.parse_org_name.return_value = "testorg"
+        main_mocks.client.list_org_repositories.side_effect = RateLimitError("Rate limit exceeded")
 
-        # Mock GitHub client to raise RateLimitError
-        mock_client = MagicMock()
-        mock_client.parse_org_name.return_value = "testorg"
-        mock_client.list_org_repositories.side_effect = RateLimitError("Rate limit exceeded")
-        mock_client_class.return_value = mock_client
-
-        with patch.object(sys, "argv", test_args):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
+        with patched_argv(ARGV_TESTORG), pytest.raises(SystemExit) as exc_info:
+            main()
 
-            assert exc_info.value.code == 1
+        assert exc_info.value.code == 1
 
-    @patch("github_org_cloner.cli.get_github_token")
-    @patch("github_org_cloner.cli.clone_all_repositories")
-    @patch("github_org_cloner.cli.GitHubClient")
     def test_main_no_repos(
         self,
-        mock_client_class: MagicMock,
-        mock_clone_all: MagicMock,
-        mock_get_token: MagicMock,
+        main_mocks: MainMocks,
         tmp_path: Path,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test handling of organization with no repositories."""
         monkeypatch.setenv("GITHUB_ORG_CLONE_BASE_DIR", str(tmp_path))
-        test_args = ["prog", "https://github.com/emptyorg"]
 
-        mock_get_token.return_value = None
+        main_mocks.client.parse_org_name.return_value = "emptyorg"
+        main_mocks.client.list_org_repositories.return_value = []
 
-        # Mock GitHub client to return no repos
-        mock_client = MagicMock()
-        mock_client.parse_org_name.return_value = "emptyorg"
-        mock_client.list_org_repositories.return_value = []
-        mock_client_class.return_value = mock_client
-
-        with patch.object(sys, "argv", test_args):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
+        with (
+            patched_argv(["prog", "https://github.com/emptyorg"]),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            main()
 
-            # Should exit with 0 (success) but warning about no repos
-            assert exc_info.value.code == 0
+        # Should exit with 0 (success) but warning about no repos
+        assert exc_info.value.code == 0
 
         # Verify clone was NOT called
-        mock_clone_all.assert_not_called()
+        main_mocks.clone_all.assert_not_called()
 
-    @patch("github_org_cloner.cli.get_github_token")
-    @patch("github_org_cloner.cli.run_setup_for_all")
-    @patch("github_org_cloner.cli.clone_all_repositories")
-    @patch("github_org_cloner.cli.GitHubClient")
     def test_main_with_setup(
         self,
-        mock_client_class: MagicMock,
-        mock_clone_all: MagicMock,
-        mock_setup: MagicMock,
-        mock_get_token: MagicMock,
+        main_mocks: MainMocks,
+        sample_repos: list[Repository],
         tmp_path: Path,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test main function with --run-setup flag."""
         monkeypatch.setenv("GITHUB_ORG_CLONE_BASE_DIR", str(tmp_path))
-        test_args = ["prog", "https://github.com/testorg", "--run-setup"]
 
-        mock_get_token.return_value = None
+        main_mocks.client.parse_org_name.return_value = "testorg"
+        main_mocks.client.list_org_repositories.return_value = sample_repos[:1]
+        main_mocks.clone_all.return_value = {"repo1": (True, None)}
 
-        # Mock GitHub client
-        mock_client = MagicMock()
-        mock_client.parse_org_name.return_value = "testorg"
-        mock_client.list_org_repositories.return_value = [MagicMock(name="repo1")]
-        mock_client_class.return_value = mock_client
-
-        # Mock clone results
-        mock_clone_all.return_value = {"repo1": (True, None)}
-
-        with patch.object(sys, "argv", test_args):
+        with patched_argv([*ARGV_TESTORG, "--run-setup"]):
             main()
 
         # Verify setup was called
-        mock_setup.assert_called_once()
-        call_args = mock_setup.call_args[0]
+        main_mocks.setup.assert_called_once()
+        call_args = main_mocks.setup.call_args[0]
         assert len(call_args[0]) == 1  # One successful repo
         assert call_args[0][0] == tmp_path / "testorg" / "repo1"
 
-    @patch("github_org_cloner.cli.get_github_token")
-    @patch("github_org_cloner.cli.clone_all_repositories")
-    @patch("github_org_cloner.cli.GitHubClient")
     def test_main_with_failures(
         self,
-        mock_client_class: MagicMock,
-        mock_clone_all: MagicMock,
-        mock_get_token: MagicMock,
+        main_mocks: MainMocks,
+        sample_repos: list[Repository],
         tmp_path: Path,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test main function when some clones fail."""
         monkeypatch.setenv("GITHUB_ORG_CLONE_BASE_DIR", str(tmp_path))
-        test_args = ["prog", "https://github.com/testorg"]
-
-        mock_get_token.return_value = None
 
-        # Mock GitHub client
-        mock_client = MagicMock()
-        mock_client.parse_org_name.return_value = "testorg"
-        mock_client.list_org_repositories.return_value = [
-            MagicMock(name="repo1"),
-            MagicMock(name="repo2"),
-        ]
-        mock_client_class.return_value = mock_client
-
-        # Mock clone results with one failure
-        mock_clone_all.return_value = {
+        main_mocks.client.parse_org_name.return_value = "testorg"
+        main_mocks.client.list_org_repositories.return_value = sample_repos[:2]
+        main_mocks.clone_all.return_value = {
             "repo1": (True, None),
             "repo2": (False, "Clone failed"),
         }
 
-        with patch.object(sys, "argv", test_args):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
+        with patched_argv(ARGV_TESTORG), pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+
+    def test_main_max_workers_from_env(
+        self,
+        main_mocks: MainMocks,
+        sample_repos: list[Repository],
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that GITHUB_ORG_CLONER_MAX_WORKERS sets the worker count."""
+        monkeypatch.setenv("GITHUB_ORG_CLONE_BASE_DIR", str(tmp_path))
+        monkeypatch.setenv("GITHUB_ORG_CLONER_MAX_WORKERS", "6")
+
+        main_mocks.client.parse_org_name.return_value = "testorg"
+        main_mocks.client.list_org_repositories.return_value = sample_repos[:1]
+        main_mocks.clone_all.return_value = {"repo1": (True, None)}
+
+        with patched_argv([*ARGV_TESTORG, "--parallel"]):
+            main()
+
+        assert main_mocks.clone_all.call_args.kwargs["max_workers"] == 6
+
+    def test_main_invalid_max_workers_env(
+        self,
+        main_mocks: MainMocks,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test error when GITHUB_ORG_CLONER_MAX_WORKERS is not a positive integer."""
+        monkeypatch.setenv("GITHUB_ORG_CLONE_BASE_DIR", str(tmp_path))
+        monkeypatch.setenv("GITHUB_ORG_CLONER_MAX_WORKERS", "many")
+
+        with patched_argv(ARGV_TESTORG), pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+
+    @pytest.mark.parametrize("max_workers", ["0", "-2"], ids=["zero", "negative"])
+    def test_main_invalid_max_workers(
+        self,
+        main_mocks: MainMocks,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        max_workers: str,
+    ) -> None:
+        """Test error when --max-workers is not a positive integer."""
+        monkeypatch.setenv("GITHUB_ORG_CLONE_BASE_DIR", str(tmp_path))
+
+        with (
+            patched_argv([*ARGV_TESTORG, "--parallel", "--max-workers", max_workers]),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            main()
+
+        assert exc_info.value.code == 1
+        main_mocks.clone_all.assert_not_called()
+
+    def test_main_shallow(
+        self,
+        main_mocks: MainMocks,
+        sample_repos: list[Repository],
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that --shallow clones a single branch at depth 1 without blobs."""
+        monkeypatch.setenv("GITHUB_ORG_CLONE_BASE_DIR", str(tmp_path))
+
+        main_mocks.client.parse_org_name.return_value = "testorg"
+        main_mocks.client.list_org_repositories.return_value = sample_repos[:1]
+        main_mocks.clone_all.return_value = {"repo1": (True, None)}
+
+        with patched_argv([*ARGV_TESTORG, "--shallow"]):
+            main()
 
-            assert exc_info.value.code == 1
+        kwargs = main_mocks.clone_all.call_args.kwargs
+        assert kwargs["depth"] == 1
+        assert kwargs["single_branch"] is True
+        assert kwargs["filter_spec"] == "blob:none"
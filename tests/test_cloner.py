@@ -1,8 +1,12 @@
 """Tests for the repository cloning logic."""
 
+import logging
+import socket
 import subprocess
+import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from typing import Any
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
@@ -10,33 +14,49 @@ from github_org_cloner.cloner import (
     CloneError,
     clone_all_repositories,
     clone_repository,
+    default_max_workers,
+    prewarm_dns,
 )
 from github_org_cloner.github_client import Repository
+from github_org_cloner.pool import get_pool
+
+
+@pytest.fixture(autouse=True)
+def no_pygit2(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make pygit2 unavailable so clones go through the git subprocess path."""
+    monkeypatch.setitem(sys.modules, "pygit2", None)
 
 
 @pytest.fixture
-def sample_repo() -> Repository:
-    """Create a sample repository for testing."""
-    return Repository(
-        name="test-repo",
-        clone_url="https://github.com/testorg/test-repo.git",
-        ssh_url="git@github.com:testorg/test-repo.git",
-        description="A test repository",
-    )
+def fake_pygit2(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Install a fake pygit2 module for the libgit2 clone path."""
+    module = MagicMock()
+    module.GitError = type("GitError", (Exception,), {})
+    monkeypatch.setitem(sys.modules, "pygit2", module)
+    return module
 
 
 @pytest.fixture
-def sample_repos() -> list[Repository]:
-    """Create a list of sample repositories for testing."""
-    return [
-        Repository(
-            name=f"repo{i}",
-            clone_url=f"https://github.com/testorg/repo{i}.git",
-            ssh_url=f"git@github.com:testorg/repo{i}.git",
-            description=f"Repo {i}",
-        )
-        for i in range(1, 4)
-    ]
+def patched_run(
+    monkeypatch: pytest.MonkeyPatch,
+    success_run_result: subprocess.CompletedProcess[str],
+) -> MagicMock:
+    """Replace the git subprocess call with a mock that reports success."""
+    mock_run = MagicMock(return_value=success_run_result)
+    monkeypatch.setattr("github_org_cloner.cloner.subprocess.run", mock_run)
+    return mock_run
+
+
+@pytest.fixture(scope="module")
+def base_tmp(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create one temporary directory shared by the tests in this module."""
+    return tmp_path_factory.mktemp("clones")
+
+
+@pytest.fixture
+def clone_dir(base_tmp: Path, request: pytest.FixtureRequest) -> Path:
+    """Return a per-test base directory inside the shared temporary directory."""
+    return base_tmp / request.node.name
 
 
 class TestCloneRepository:
@@ -46,146 +66,316 @@ class TestCloneRepository:
         self,
         tmp_path: Path,
         sample_repo: Repository,
+        patched_run: MagicMock,
     ) -> None:
         """Test successful repository cloning."""
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
-
-            repo_name, success, error = clone_repository(
-                sample_repo,
-                "testorg",
-                tmp_path,
-            )
-
-            assert repo_name == "test-repo"
-            assert success is True
-            assert error is None
+        repo_name, success, error = clone_repository(
+            sample_repo,
+            "testorg",
+            tmp_path,
+        )
 
-            # Verify git clone was called correctly
-            expected_path = tmp_path / "testorg" / "test-repo"
-            mock_run.assert_called_once()
-            args = mock_run.call_args[0][0]
-            assert args[0] == "git"
-            assert args[1] == "clone"
-            assert args[2] == "https://github.com/testorg/test-repo.git"
-            assert args[3] == str(expected_path)
+        assert repo_name == "test-repo"
+        assert success is True
+        assert error is None
+
+        # Verify git clone was called correctly
+        expected_path = tmp_path / "testorg" / "test-repo"
+        patched_run.assert_called_once()
+        args = patched_run.call_args[0][0]
+        assert args == [
+            "git",
+            "-c",
+            "protocol.version=2",
+            "-c",
+            "http.version=HTTP/2",
+            "clone",
+            "https://github.com/testorg/test-repo.git",
+            str(expected_path),
+        ]
 
     def test_clone_repository_already_exists(
         self,
         tmp_path: Path,
         sample_repo: Repository,
+        patched_run: MagicMock,
     ) -> None:
         """Test cloning when repository already exists."""
         # Create the directory to simulate existing repo
         repo_path = tmp_path / "testorg" / "test-repo"
         repo_path.mkdir(parents=True)
 
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            repo_name, success, error = clone_repository(
-                sample_repo,
-                "testorg",
-                tmp_path,
-            )
+        repo_name, success, error = clone_repository(
+            sample_repo,
+            "testorg",
+            tmp_path,
+        )
 
-            assert repo_name == "test-repo"
-            assert success is False
-            assert error == "Already exists"
+        assert repo_name == "test-repo"
+        assert success is False
+        assert error == "Already exists"
 
-            # Verify git clone was NOT called
-            mock_run.assert_not_called()
+        # Verify git clone was NOT called
+        patched_run.assert_not_called()
 
-    def test_clone_repository_git_error(
+    def test_clone_repository_uses_existing_names(
         self,
         tmp_path: Path,
         sample_repo: Repository,
     ) -> None:
-        """Test handling of git clone errors."""
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            mock_run.side_effect = subprocess.CalledProcessError(
-                returncode=1,
-                cmd=["git", "clone"],
-                stderr="fatal: repository not found",
-            )
-
-            repo_name, success, error = clone_repository(
-                sample_repo,
-                "testorg",
-                tmp_path,
-            )
+        """Test that a precomputed name set is used instead of the filesystem."""
+        repo_name, success, error = clone_repository(
+            sample_repo,
+            "testorg",
+            tmp_path,
+            existing_names=frozenset({"test-repo"}),
+        )
 
-            assert repo_name == "test-repo"
-            assert success is False
-            assert "Failed to clone" in error
-            assert "fatal: repository not found" in error
+        assert (repo_name, success, error) == ("test-repo", False, "Already exists")
 
-    def test_clone_repository_timeout(
+    def test_clone_repository_uses_org_dir(
         self,
         tmp_path: Path,
         sample_repo: Repository,
+        patched_run: MagicMock,
     ) -> None:
-        """Test handling of clone timeout."""
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            mock_run.side_effect = subprocess.TimeoutExpired(
-                cmd=["git", "clone"],
-                timeout=300,
-            )
+        """Test that a precomputed organization directory is used for the target path."""
+        org_dir = tmp_path / "elsewhere"
+
+        clone_repository(sample_repo, "testorg", tmp_path, org_dir=org_dir)
+
+        assert patched_run.call_args[0][0][-1] == str(org_dir / "test-repo")
+
+    @pytest.mark.parametrize(
+        ("side_effect", "expected_fragment"),
+        [
+            (
+                subprocess.CalledProcessError(
+                    1, ["git", "clone"], stderr=b"fatal: repository not found \xff"
+                ),
+                "Failed to clone test-repo: fatal: repository not found \ufffd",
+            ),
+            (
+                subprocess.CalledProcessError(1, ["git", "clone"], stderr="fatal: auth failed"),
+                "Failed to clone test-repo: fatal: auth failed",
+            ),
+            (
+                subprocess.TimeoutExpired(cmd=["git", "clone"], timeout=300),
+                "Clone timeout for test-repo",
+            ),
+        ],
+        ids=["git_error", "git_error_text", "timeout"],
+    )
+    def test_clone_repository_error(
+        self,
+        tmp_path: Path,
+        sample_repo: Repository,
+        patched_run: MagicMock,
+        side_effect: Exception,
+        expected_fragment: str,
+    ) -> None:
+        """Test that git failures and timeouts are reported, not raised."""
+        patched_run.side_effect = side_effect
 
-            repo_name, success, error = clone_repository(
-                sample_repo,
-                "testorg",
-                tmp_path,
-            )
+        repo_name, success, error = clone_repository(sample_repo, "testorg", tmp_path)
 
-            assert repo_name == "test-repo"
-            assert success is False
-            assert "timeout" in error.lower()
+        assert repo_name == "test-repo"
+        assert success is False
+        assert expected_fragment in error
 
     def test_clone_repository_git_not_found(
         self,
         tmp_path: Path,
         sample_repo: Repository,
+        patched_run: MagicMock,
     ) -> None:
         """Test handling when git command is not found."""
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            mock_run.side_effect = FileNotFoundError("git command not found")
+        patched_run.side_effect = FileNotFoundError("git command not found")
 
-            with pytest.raises(CloneError, match="git command not found"):
-                clone_repository(sample_repo, "testorg", tmp_path)
+        with pytest.raises(CloneError, match="git command not found"):
+            clone_repository(sample_repo, "testorg", tmp_path)
 
     def test_clone_repository_dry_run(
         self,
         tmp_path: Path,
         sample_repo: Repository,
+        patched_run: MagicMock,
     ) -> None:
         """Test dry run mode doesn't actually clone."""
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            repo_name, success, error = clone_repository(
-                sample_repo,
-                "testorg",
-                tmp_path,
-                dry_run=True,
-            )
+        repo_name, success, error = clone_repository(
+            sample_repo,
+            "testorg",
+            tmp_path,
+            dry_run=True,
+        )
 
-            assert repo_name == "test-repo"
-            assert success is True
-            assert error is None
+        assert repo_name == "test-repo"
+        assert success is True
+        assert error is None
 
-            # Verify git clone was NOT called
-            mock_run.assert_not_called()
+        # Verify git clone was NOT called
+        patched_run.assert_not_called()
 
     def test_clone_repository_creates_parent_dir(
         self,
         tmp_path: Path,
         sample_repo: Repository,
+        patched_run: MagicMock,
     ) -> None:
         """Test that parent directory is created if it doesn't exist."""
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
+        clone_repository(sample_repo, "testorg", tmp_path)
 
-            clone_repository(sample_repo, "testorg", tmp_path)
+        # Verify parent directory was created
+        assert (tmp_path / "testorg").exists()
+
+    def test_clone_repository_parent_created(
+        self,
+        tmp_path: Path,
+        sample_repo: Repository,
+        patched_run: MagicMock,
+    ) -> None:
+        """Test that the parent directory is not created again when already made."""
+        clone_repository(sample_repo, "testorg", tmp_path, parent_created=True)
+
+        patched_run.assert_called_once()
+        assert not (tmp_path / "testorg").exists()
+
+    @pytest.mark.parametrize(
+        ("options", "expected"),
+        [
+            ({"depth": 1}, ["--depth=1"]),
+            ({"filter_spec": "blob:none"}, ["--filter=blob:none"]),
+            ({"single_branch": True}, ["--single-branch"]),
+            (
+                {"depth": 1, "filter_spec": "blob:none", "single_branch": True},
+                ["--depth=1", "--single-branch", "--filter=blob:none"],
+            ),
+        ],
+        ids=["depth", "filter", "single_branch", "shallow"],
+    )
+    def test_clone_repository_shallow_options(
+        self,
+        tmp_path: Path,
+        sample_repo: Repository,
+        patched_run: MagicMock,
+        options: dict[str, Any],
+        expected: list[str],
+    ) -> None:
+        """Test that depth, single-branch and filter options are passed to git."""
+        clone_repository(sample_repo, "testorg", tmp_path, **options)
+
+        args = patched_run.call_args[0][0]
+        clone_args = args[args.index("clone") + 1 :]
+        assert clone_args == [*expected, "https://github.com/testorg/test-repo.git", ANY]
+
+
+class TestCloneRepositoryPygit2:
+    """Tests for cloning a single repository in-process with pygit2."""
+
+    def test_clone_with_pygit2(
+        self,
+        tmp_path: Path,
+        sample_repo: Repository,
+        fake_pygit2: MagicMock,
+        patched_run: MagicMock,
+    ) -> None:
+        """Test that pygit2 is used instead of the git subprocess when available."""
+        repo_name, success, error = clone_repository(sample_repo, "testorg", tmp_path)
+
+        patched_run.assert_not_called()
+
+        assert (repo_name, success, error) == ("test-repo", True, None)
+        fake_pygit2.clone_repository.assert_called_once_with(
+            "https://github.com/testorg/test-repo.git",
+            str(tmp_path / "testorg" / "test-repo"),
+            callbacks=fake_pygit2.RemoteCallbacks.return_value,
+            depth=0,
+        )
+        fake_pygit2.RemoteCallbacks.assert_called_once_with(credentials=None)
+
+    def test_clone_with_pygit2_uses_token(
+        self,
+        tmp_path: Path,
+        sample_repo: Repository,
+        fake_pygit2: MagicMock,
+    ) -> None:
+        """Test that the token is passed to pygit2 as HTTPS credentials."""
+        clone_repository(sample_repo, "testorg", tmp_path, token="test_token")
+
+        fake_pygit2.UserPass.assert_called_once_with("test_token", "x-oauth-basic")
+        fake_pygit2.RemoteCallbacks.assert_called_once_with(
+            credentials=fake_pygit2.UserPass.return_value
+        )
+
+    def test_clone_with_pygit2_depth(
+        self,
+        tmp_path: Path,
+        sample_repo: Repository,
+        fake_pygit2: MagicMock,
+    ) -> None:
+        """Test that shallow clones pass the depth to pygit2."""
+        clone_repository(sample_repo, "testorg", tmp_path, depth=1)
+
+        assert fake_pygit2.clone_repository.call_args.kwargs["depth"] == 1
+
+    def test_clone_with_pygit2_timeout(
+        self,
+        tmp_path: Path,
+        sample_repo: Repository,
+        fake_pygit2: MagicMock,
+    ) -> None:
+        """Test that a pygit2 clone is aborted once it exceeds the clone timeout."""
 
-            # Verify parent directory was created
-            assert (tmp_path / "testorg").exists()
+        def slow_clone(*args: Any, callbacks: MagicMock, **kwargs: Any) -> None:
+            callbacks.transfer_progress(MagicMock())
+
+        fake_pygit2.clone_repository.side_effect = slow_clone
+
+        with patch("github_org_cloner.cloner.time.monotonic", side_effect=[0, 301]):
+            repo_name, success, error = clone_repository(sample_repo, "testorg", tmp_path)
+
+        assert (repo_name, success) == ("test-repo", False)
+        assert error == "Clone timeout for test-repo (exceeded 5 minutes)"
+
+    def test_clone_with_pygit2_server_timeouts(
+        self,
+        tmp_path: Path,
+        sample_repo: Repository,
+        fake_pygit2: MagicMock,
+    ) -> None:
+        """Test that libgit2 connect and read timeouts are set so stalled clones fail."""
+        clone_repository(sample_repo, "testorg", tmp_path)
+
+        assert fake_pygit2.settings.server_connect_timeout == 60_000
+        assert fake_pygit2.settings.server_timeout == 60_000
+
+    def test_clone_with_filter_uses_git(
+        self,
+        tmp_path: Path,
+        sample_repo: Repository,
+        fake_pygit2: MagicMock,
+        patched_run: MagicMock,
+    ) -> None:
+        """Test that partial clones fall back to git, which libgit2 can't do."""
+        clone_repository(sample_repo, "testorg", tmp_path, filter_spec="blob:none")
+
+        patched_run.assert_called_once()
+        fake_pygit2.clone_repository.assert_not_called()
+
+    def test_clone_with_pygit2_error(
+        self,
+        tmp_path: Path,
+        sample_repo: Repository,
+        fake_pygit2: MagicMock,
+    ) -> None:
+        """Test handling of libgit2 clone errors."""
+        fake_pygit2.clone_repository.side_effect = fake_pygit2.GitError("repository not found")
+
+        repo_name, success, error = clone_repository(sample_repo, "testorg", tmp_path)
+
+        assert repo_name == "test-repo"
+        assert success is False
+        assert "repository not found" in error
 
 
 class TestCloneAllRepositories:
@@ -193,120 +383,300 @@ class TestCloneAllRepositories:
 
     def test_clone_all_sequential(
         self,
-        tmp_path: Path,
+        clone_dir: Path,
         sample_repos: list[Repository],
+        patched_run: MagicMock,
     ) -> None:
         """Test sequential cloning of repositories."""
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
+        results = clone_all_repositories(
+            repos=sample_repos,
+            org_name="testorg",
+            base_dir=clone_dir,
+            parallel=False,
+        )
 
-            results = clone_all_repositories(
-                repos=sample_repos,
-                org_name="testorg",
-                base_dir=tmp_path,
-                parallel=False,
-            )
+        assert len(results) == 3
+        assert all(success for success, _ in results.values())
+        assert patched_run.call_count == 3
 
-            assert len(results) == 3
-            assert all(success for success, _ in results.values())
-            assert mock_run.call_count == 3
+    def test_clone_all_sequential_unexpected_error(
+        self,
+        clone_dir: Path,
+        sample_repos: list[Repository],
+        patched_run: MagicMock,
+    ) -> None:
+        """Test that an unexpected error is recorded against the repository that raised it."""
+        patched_run.side_effect = [
+            patched_run.return_value,
+            RuntimeError("boom"),
+            patched_run.return_value,
+        ]
+
+        results = clone_all_repositories(
+            repos=sample_repos,
+            org_name="testorg",
+            base_dir=clone_dir,
+            parallel=False,
+        )
+
+        assert results == {
+            "repo1": (True, None),
+            "repo2": (False, "boom"),
+            "repo3": (True, None),
+        }
 
     def test_clone_all_parallel(
         self,
-        tmp_path: Path,
+        clone_dir: Path,
         sample_repos: list[Repository],
+        patched_run: MagicMock,
     ) -> None:
         """Test parallel cloning of repositories."""
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
+        results = clone_all_repositories(
+            repos=sample_repos,
+            org_name="testorg",
+            base_dir=clone_dir,
+            parallel=True,
+            max_workers=2,
+        )
 
-            results = clone_all_repositories(
-                repos=sample_repos,
+        assert len(results) == 3
+        assert all(success for success, _ in results.values())
+        assert patched_run.call_count == 3
+
+    def test_clone_all_parallel_map(
+        self,
+        clone_dir: Path,
+        sample_repos: list[Repository],
+        patched_run: MagicMock,
+    ) -> None:
+        """Test parallel cloning with results collected via Executor.map."""
+        results = clone_all_repositories(
+            repos=sample_repos,
+            org_name="testorg",
+            base_dir=clone_dir,
+            parallel=True,
+            max_workers=2,
+            use_map=True,
+        )
+
+        assert list(results) == ["repo1", "repo2", "repo3"]
+        assert all(success for success, _ in results.values())
+        assert patched_run.call_count == 3
+
+    @pytest.mark.usefixtures("patched_run")
+    def test_clone_all_parallel_progress_bar(
+        self,
+        clone_dir: Path,
+        sample_repos: list[Repository],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that parallel progress is reported through tqdm when it is installed."""
+        fake_tqdm = MagicMock()
+        monkeypatch.setitem(sys.modules, "tqdm", fake_tqdm)
+
+        clone_all_repositories(
+            repos=sample_repos,
+            org_name="testorg",
+            base_dir=clone_dir,
+            parallel=True,
+            max_workers=2,
+        )
+
+        fake_tqdm.tqdm.assert_called_once_with(total=3, unit="repo", desc="Cloning")
+        progress_bar = fake_tqdm.tqdm.return_value
+        assert progress_bar.update.call_count == 3
+        progress_bar.close.assert_called_once()
+
+    @pytest.mark.usefixtures("patched_run")
+    def test_clone_all_parallel_progress_log(
+        self,
+        clone_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test that progress is logged every tenth of the way without tqdm."""
+        monkeypatch.setitem(sys.modules, "tqdm", None)
+        repos = [
+            Repository(name=f"repo{i}", clone_url="", ssh_url="", description=None)
+            for i in range(20)
+        ]
+
+        with caplog.at_level(logging.INFO):
+            clone_all_repositories(
+                repos=repos,
                 org_name="testorg",
-                base_dir=tmp_path,
+                base_dir=clone_dir,
                 parallel=True,
-                max_workers=2,
+                max_workers=4,
             )
 
-            assert len(results) == 3
-            assert all(success for success, _ in results.values())
-            assert mock_run.call_count == 3
+        assert caplog.text.count("Progress:") == 10
+        assert "Progress: 20/20 repositories processed" in caplog.text
+
+    def test_clone_all_parallel_git_not_found(
+        self,
+        clone_dir: Path,
+        sample_repos: list[Repository],
+        patched_run: MagicMock,
+    ) -> None:
+        """Test that unexpected errors in parallel clones are reported per repository."""
+        patched_run.side_effect = FileNotFoundError("git")
+
+        results = clone_all_repositories(
+            repos=sample_repos,
+            org_name="testorg",
+            base_dir=clone_dir,
+            parallel=True,
+            max_workers=2,
+        )
+
+        assert len(results) == 3
+        assert all(not success for success, _ in results.values())
+        assert "git command not found" in results["repo1"][1]
 
     def test_clone_all_empty_list(
         self,
-        tmp_path: Path,
+        clone_dir: Path,
     ) -> None:
         """Test cloning with empty repository list."""
         results = clone_all_repositories(
             repos=[],
             org_name="testorg",
-            base_dir=tmp_path,
+            base_dir=clone_dir,
         )
 
         assert len(results) == 0
 
     def test_clone_all_mixed_results(
         self,
-        tmp_path: Path,
+        clone_dir: Path,
         sample_repos: list[Repository],
+        patched_run: MagicMock,
     ) -> None:
         """Test cloning with some successes and some failures."""
         # Create first repo directory to simulate it already existing
-        (tmp_path / "testorg" / "repo1").mkdir(parents=True)
+        (clone_dir / "testorg" / "repo1").mkdir(parents=True)
+
+        # Second repo succeeds, third repo fails
+        patched_run.side_effect = [
+            patched_run.return_value,  # repo2 succeeds
+            subprocess.CalledProcessError(1, ["git"], stderr=b"error"),  # repo3 fails
+        ]
 
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            # Second repo succeeds, third repo fails
-            mock_run.side_effect = [
-                MagicMock(returncode=0),  # repo2 succeeds
-                subprocess.CalledProcessError(1, ["git"], stderr="error"),  # repo3 fails
-            ]
+        results = clone_all_repositories(
+            repos=sample_repos,
+            org_name="testorg",
+            base_dir=clone_dir,
+            parallel=False,
+        )
 
+        assert len(results) == 3
+        assert results["repo1"] == (False, "Already exists")
+        assert results["repo2"][0] is True
+        assert results["repo3"][0] is False
+
+    def test_clone_all_skips_existing_without_scheduling(
+        self,
+        clone_dir: Path,
+        sample_repos: list[Repository],
+    ) -> None:
+        """Test that existing repositories are skipped before any clone is scheduled."""
+        for repo in sample_repos:
+            (clone_dir / "testorg" / repo.name).mkdir(parents=True)
+
+        with patch("github_org_cloner.cloner.get_pool") as mock_get_pool:
             results = clone_all_repositories(
                 repos=sample_repos,
                 org_name="testorg",
-                base_dir=tmp_path,
-                parallel=False,
+                base_dir=clone_dir,
+                parallel=True,
             )
 
-            assert len(results) == 3
-            assert results["repo1"] == (False, "Already exists")
-            assert results["repo2"][0] is True
-            assert results["repo3"][0] is False
+        assert results == {repo.name: (False, "Already exists") for repo in sample_repos}
+        mock_get_pool.assert_not_called()
 
     def test_clone_all_dry_run(
         self,
-        tmp_path: Path,
+        clone_dir: Path,
         sample_repos: list[Repository],
+        patched_run: MagicMock,
     ) -> None:
         """Test dry run mode for all repositories."""
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            results = clone_all_repositories(
-                repos=sample_repos,
-                org_name="testorg",
-                base_dir=tmp_path,
-                dry_run=True,
-            )
+        results = clone_all_repositories(
+            repos=sample_repos,
+            org_name="testorg",
+            base_dir=clone_dir,
+            dry_run=True,
+        )
 
-            assert len(results) == 3
-            assert all(success for success, _ in results.values())
+        assert len(results) == 3
+        assert all(success for success, _ in results.values())
 
-            # Verify git clone was never called
-            mock_run.assert_not_called()
+        # Verify git clone was never called
+        patched_run.assert_not_called()
 
     def test_clone_all_creates_org_directory(
         self,
-        tmp_path: Path,
+        clone_dir: Path,
         sample_repos: list[Repository],
+        patched_run: MagicMock,
     ) -> None:
         """Test that organization directory is created."""
-        with patch("github_org_cloner.cloner.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
+        clone_all_repositories(
+            repos=sample_repos,
+            org_name="testorg",
+            base_dir=clone_dir,
+        )
+
+        assert (clone_dir / "testorg").exists()
+        assert (clone_dir / "testorg").is_dir()
 
+
+class TestDefaultMaxWorkers:
+    """Tests for the default parallel worker count."""
+
+    @pytest.mark.parametrize(
+        "repo_count,expected",
+        [(0, 1), (1, 1), (2, 2), (20, 20), (32, 32), (500, 32)],
+    )
+    def test_default_max_workers(self, repo_count: int, expected: int) -> None:
+        """Test that the default uses one worker per repository, capped at 32."""
+        assert default_max_workers(repo_count) == expected
+
+    @pytest.mark.usefixtures("patched_run")
+    def test_clone_all_uses_default_max_workers(
+        self,
+        tmp_path: Path,
+        sample_repos: list[Repository],
+    ) -> None:
+        """Test that parallel cloning sizes the pool to the repositories to clone."""
+        with patch("github_org_cloner.cloner.get_pool", wraps=get_pool) as mock_get_pool:
             clone_all_repositories(
                 repos=sample_repos,
                 org_name="testorg",
                 base_dir=tmp_path,
+                parallel=True,
             )
 
-            assert (tmp_path / "testorg").exists()
-            assert (tmp_path / "testorg").is_dir()
+        mock_get_pool.assert_called_once_with(3)
+
+
+class TestPrewarmDns:
+    """Tests for resolving clone hosts ahead of time."""
+
+    def test_resolves_each_host_once(self, sample_repos: list[Repository]) -> None:
+        """Test that each distinct clone host is resolved a single time."""
+        with patch("github_org_cloner.cloner.socket.getaddrinfo") as mock_getaddrinfo:
+            prewarm_dns(sample_repos)
+
+        mock_getaddrinfo.assert_called_once()
+        assert mock_getaddrinfo.call_args.args == ("github.com", 443)
+
+    def test_ignores_resolution_errors(self, sample_repos: list[Repository]) -> None:
+        """Test that resolution failures are left for git to report."""
+        with patch(
+            "github_org_cloner.cloner.socket.getaddrinfo",
+            side_effect=socket.gaierror("no such host"),
+        ):
+            prewarm_dns(sample_repos)
@@ -0,0 +1,35 @@
+"""Tests for configuration loading."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from github_org_cloner import config
+from github_org_cloner.config import Config, load_environment
+
+
+@pytest.fixture(autouse=True)
+def env_not_loaded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Reset the lazy .env loading state for each test."""
+    monkeypatch.setattr(config, "_env_loaded", False)
+
+
+class TestLoadEnvironment:
+    """Tests for lazily loading the .env file."""
+
+    def test_loads_once(self) -> None:
+        """Test that the .env file is only searched for on the first call."""
+        with patch("github_org_cloner.config.load_dotenv") as mock_load_dotenv:
+            load_environment()
+            load_environment()
+
+        mock_load_dotenv.assert_called_once_with(override=False)
+
+    def test_from_args_loads_environment(self, tmp_path: Path) -> None:
+        """Test that building a Config loads the .env file."""
+        with patch("github_org_cloner.config.load_dotenv") as mock_load_dotenv:
+            result = Config.from_args(base_dir=str(tmp_path))
+
+        mock_load_dotenv.assert_called_once()
+        assert result.base_dir == tmp_path.resolve()
@@ -1,8 +1,17 @@
 """Tests for the GitHub API client."""
 
+import dataclasses
+import json
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock, patch
+
+import orjson
 import pytest
 import requests
-import requests_mock
+from requests.adapters import HTTPAdapter
 
 from github_org_cloner.github_client import (
     GitHubAPIError,
@@ -11,218 +20,685 @@ from github_org_cloner.github_client import (
     RateLimitError,
     Repository,
 )
+from github_org_cloner.pool import get_pool
+
+if TYPE_CHECKING:
+    from requests_mock import Mocker
 
 
 class TestParseOrgName:
     """Tests for parsing organization names from URLs."""
 
-    def test_parse_basic_url(self) -> None:
-        """Test parsing a basic GitHub organization URL."""
-        assert GitHubClient.parse_org_name("https://github.com/openai") == "openai"
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            ("https://github.com/openai", "openai"),
+            ("https://github.com/openai/", "openai"),
+            ("github.com/openai", "openai"),
+            ("https://www.github.com/openai", "openai"),
+            ("https://github.com/my-org-name", "my-org-name"),
+            ("https://github.com/org123", "org123"),
+            ("https://github.com/openai/gpt-2", "openai"),
+            ("https://github.com/openai?tab=repositories", "openai"),
+        ],
+        ids=[
+            "basic",
+            "trailing_slash",
+            "no_scheme",
+            "www",
+            "hyphens",
+            "numbers",
+            "repository_path",
+            "query",
+        ],
+    )
+    def test_parse_org_name(self, url: str, expected: str) -> None:
+        """Test parsing organization names from valid GitHub URLs."""
+        assert GitHubClient.parse_org_name(url) == expected
+
+    @pytest.mark.parametrize(
+        ("url", "match"),
+        [
+            ("https://gitlab.com/openai", "Invalid GitHub URL"),
+            ("https://github.com.example.com/openai", "Invalid GitHub URL"),
+            ("https://github.com/", "No organization name found"),
+            ("github.com/\n", "No organization name found"),
+            ("https://github.com/-invalid", "Invalid organization name format"),
+            ("https://github.com/open;x/y", "Invalid organization name format: open;x"),
+        ],
+        ids=[
+            "invalid_domain",
+            "lookalike_domain",
+            "empty_org_name",
+            "newline_org_name",
+            "invalid_org_format",
+            "semicolon_org_name",
+        ],
+    )
+    def test_parse_org_name_invalid(self, url: str, match: str) -> None:
+        """Test that invalid URLs and organization names raise ValueError."""
+        with pytest.raises(ValueError, match=match):
+            GitHubClient.parse_org_name(url)
+
+    def test_parse_org_name_cached(self) -> None:
+        """Test that repeated parses of the same URL are served from the cache."""
+        url = "https://github.com/cached-org"
+        before = GitHubClient.parse_org_name.cache_info().hits
+
+        assert GitHubClient.parse_org_name(url) == "cached-org"
+        assert GitHubClient.parse_org_name(url) == "cached-org"
+
+        assert GitHubClient.parse_org_name.cache_info().hits == before + 1
+
+
+class TestSession:
+    """Tests for the client's HTTP session configuration."""
+
+    def test_session_retries_and_pool(self) -> None:
+        """Test that HTTPS requests use a pooled adapter that retries gateway errors."""
+        client = GitHubClient()
+        adapter = client.session.get_adapter("https://api.github.com")
+
+        assert isinstance(adapter, HTTPAdapter)
+        assert adapter._pool_maxsize == GitHubClient.POOL_SIZE  # type: ignore[attr-defined]
+        assert adapter.max_retries.total == 3
+        assert 503 in adapter.max_retries.status_forcelist
+        assert "POST" in adapter.max_retries.allowed_methods
+
+    def test_injected_session(self, fake_session: MagicMock) -> None:
+        """Test that a given session is used as-is, with the API headers added."""
+        client = GitHubClient(token="secret", session=fake_session)
+
+        assert client.session is fake_session
+        fake_session.mount.assert_not_called()
+        assert fake_session.headers["Authorization"] == "token secret"
+
+
+def _repo_json(name: str) -> dict:
+    """Build a REST repository object for the given repository name."""
+    return {
+        "name": name,
+        "clone_url": f"https://github.com/testorg/{name}.git",
+        "ssh_url": f"git@github.com:testorg/{name}.git",
+        "description": None,
+    }
+
+
+def _response(
+    payload: Any = None,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+    text: str | None = None,
+) -> requests.Response:
+    """Build a response with its body already loaded, as the session would return it."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.encoding = "utf-8"
+    if text is not None:
+        response._content = text.encode()
+    else:
+        response._content = orjson.dumps(payload) if payload is not None else b""
+    return response
+
+
+# Responses shared by tests that only read them
+PAGE_1_OF_2 = _response(
+    [_repo_json(f"repo{i}") for i in range(1, 101)],
+    headers={"Link": '<https://api.github.com/orgs/testorg/repos?page=2>; rel="next"'},
+)
+PAGE_2_OF_2 = _response([_repo_json("repo101")])
+SINGLE_REPO_PAGE = _response([_repo_json("repo1")])
+TWO_REPO_PAGE = _response(
+    [{**_repo_json("repo1"), "description": "Test repo 1"}, _repo_json("repo2")]
+)
 
-    def test_parse_url_with_trailing_slash(self) -> None:
-        """Test parsing URL with trailing slash."""
-        assert GitHubClient.parse_org_name("https://github.com/openai/") == "openai"
 
-    def test_parse_url_without_scheme(self) -> None:
-        """Test parsing URL without scheme."""
-        assert GitHubClient.parse_org_name("github.com/openai") == "openai"
+class TestListOrgRepositories:
+    """Tests for listing organization repositories."""
 
-    def test_parse_url_with_www(self) -> None:
-        """Test parsing URL with www prefix."""
-        assert GitHubClient.parse_org_name("https://www.github.com/openai") == "openai"
+    def test_list_repos_single_page(self, fake_session: MagicMock) -> None:
+        """Test listing repositories with a single page of results."""
+        fake_session.request.return_value = TWO_REPO_PAGE
 
-    def test_parse_org_name_with_hyphens(self) -> None:
-        """Test parsing org name with hyphens."""
-        assert GitHubClient.parse_org_name("https://github.com/my-org-name") == "my-org-name"
+        client = GitHubClient(session=fake_session)
+        repos = client.list_org_repositories("testorg")
 
-    def test_parse_org_name_with_numbers(self) -> None:
-        """Test parsing org name with numbers."""
-        assert GitHubClient.parse_org_name("https://github.com/org123") == "org123"
+        assert repos == [
+            Repository(
+                "repo1",
+                "https://github.com/testorg/repo1.git",
+                "git@github.com:testorg/repo1.git",
+                "Test repo 1",
+            ),
+            Repository(
+                "repo2",
+                "https://github.com/testorg/repo2.git",
+                "git@github.com:testorg/repo2.git",
+                None,
+            ),
+        ]
 
-    def test_parse_invalid_domain(self) -> None:
-        """Test parsing URL from non-GitHub domain."""
-        with pytest.raises(ValueError, match="Invalid GitHub URL"):
-            GitHubClient.parse_org_name("https://gitlab.com/openai")
+        method, url = fake_session.request.call_args.args
+        assert (method, url) == ("GET", "https://api.github.com/orgs/testorg/repos")
+        assert fake_session.request.call_args.kwargs["params"] == {
+            "per_page": 100,
+            "page": 1,
+            "type": "all",
+        }
 
-    def test_parse_empty_org_name(self) -> None:
-        """Test parsing URL without organization name."""
-        with pytest.raises(ValueError, match="No organization name found"):
-            GitHubClient.parse_org_name("https://github.com/")
+    def test_list_repos_multiple_pages(self, fake_session: MagicMock) -> None:
+        """Test listing repositories with pagination."""
+        fake_session.request.side_effect = [PAGE_1_OF_2, PAGE_2_OF_2]
 
-    def test_parse_invalid_org_format(self) -> None:
-        """Test parsing invalid organization name format."""
-        with pytest.raises(ValueError, match="Invalid organization name format"):
-            GitHubClient.parse_org_name("https://github.com/-invalid")
+        client = GitHubClient(session=fake_session)
+        repos = client.list_org_repositories("testorg")
 
+        assert len(repos) == 101
+        assert repos[0].name == "repo1"
+        assert repos[100].name == "repo101"
+        pages = [call.kwargs["params"]["page"] for call in fake_session.request.call_args_list]
+        assert pages == [1, 2]
 
-class TestListOrgRepositories:
-    """Tests for listing organization repositories."""
+    def test_list_repos_parallel_pages(self, fake_session: MagicMock) -> None:
+        """Test that remaining pages are fetched once rel="last" is known."""
+        last_link = '<https://api.github.com/orgs/testorg/repos?per_page=100&page=3>; rel="last"'
 
-    def test_list_repos_single_page(self, requests_mock: requests_mock.Mocker) -> None:
-        """Test listing repositories with a single page of results."""
-        mock_response = [
-            {
-                "name": "repo1",
-                "clone_url": "https://github.com/testorg/repo1.git",
-                "ssh_url": "git@github.com:testorg/repo1.git",
-                "description": "Test repo 1",
-            },
-            {
-                "name": "repo2",
-                "clone_url": "https://github.com/testorg/repo2.git",
-                "ssh_url": "git@github.com:testorg/repo2.git",
-                "description": None,
-            },
-        ]
+        def respond(method: str, url: str, **kwargs: Any) -> requests.Response:
+            page = kwargs["params"]["page"]
+            return _response(
+                [_repo_json(f"repo{page}")],
+                headers={"Link": last_link} if page == 1 else None,
+            )
 
-        requests_mock.get(
-            "https://api.github.com/orgs/testorg/repos",
-            json=mock_response,
-        )
+        fake_session.request.side_effect = respond
 
-        client = GitHubClient()
+        client = GitHubClient(session=fake_session)
         repos = client.list_org_repositories("testorg")
 
-        assert len(repos) == 2
-        assert repos[0].name == "repo1"
-        assert repos[0].clone_url == "https://github.com/testorg/repo1.git"
-        assert repos[0].description == "Test repo 1"
-        assert repos[1].name == "repo2"
-        assert repos[1].description is None
+        # Pages are returned in order even though they're fetched concurrently
+        assert [repo.name for repo in repos] == ["repo1", "repo2", "repo3"]
+        assert fake_session.request.call_count == 3
 
-    def test_list_repos_multiple_pages(self, requests_mock: requests_mock.Mocker) -> None:
-        """Test listing repositories with pagination."""
-        page1_response = [
-            {
-                "name": f"repo{i}",
-                "clone_url": f"https://github.com/testorg/repo{i}.git",
-                "ssh_url": f"git@github.com:testorg/repo{i}.git",
-                "description": f"Repo {i}",
-            }
-            for i in range(1, 101)
-        ]
+    def test_list_repos_many_pages_concurrent(self, fake_session: MagicMock) -> None:
+        """Test that pages after the first are all requested at the same time."""
+        last_link = '<https://api.github.com/orgs/testorg/repos?per_page=100&page=5>; rel="last"'
+        # Only releases once pages 2-5 are all in flight, so sequential fetching would time out
+        in_flight = threading.Barrier(4, timeout=5)
 
-        page2_response = [
-            {
-                "name": "repo101",
-                "clone_url": "https://github.com/testorg/repo101.git",
-                "ssh_url": "git@github.com:testorg/repo101.git",
-                "description": "Repo 101",
-            }
-        ]
+        def respond(method: str, url: str, **kwargs: Any) -> requests.Response:
+            page = kwargs["params"]["page"]
+            if page == 1:
+                return _response([_repo_json("repo1")], headers={"Link": last_link})
+            in_flight.wait()
+            return _response([_repo_json(f"repo{page}")])
+
+        fake_session.request.side_effect = respond
+
+        client = GitHubClient(session=fake_session)
+        repos = client.list_org_repositories("testorg")
 
-        requests_mock.get(
-            "https://api.github.com/orgs/testorg/repos?per_page=100&page=1&type=all",
-            json=page1_response,
-            headers={"Link": '<https://api.github.com/orgs/testorg/repos?page=2>; rel="next"'},
+        assert [repo.name for repo in repos] == [f"repo{page}" for page in range(1, 6)]
+        assert fake_session.request.call_count == 5
+
+    def test_list_repos_page_concurrency_bounded(self, fake_session: MagicMock) -> None:
+        """Test that page requests stay within MAX_PAGE_WORKERS even if the pool is larger."""
+        get_pool(32)
+        last_link = '<https://api.github.com/orgs/testorg/repos?per_page=100&page=30>; rel="last"'
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def respond(method: str, url: str, **kwargs: Any) -> requests.Response:
+            nonlocal in_flight, peak
+            page = kwargs["params"]["page"]
+            if page == 1:
+                return _response([_repo_json("repo1")], headers={"Link": last_link})
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return _response([_repo_json(f"repo{page}")])
+
+        fake_session.request.side_effect = respond
+
+        client = GitHubClient(session=fake_session)
+        repos = client.list_org_repositories("testorg")
+
+        assert len(repos) == 30
+        assert 1 < peak <= GitHubClient.MAX_PAGE_WORKERS
+
+    def test_list_repos_filters(self, fake_session: MagicMock) -> None:
+        """Test that forks, archived and private repos can be left out of REST results."""
+        fake_session.request.return_value = _response(
+            [
+                _repo_json("source"),
+                {**_repo_json("fork"), "fork": True},
+                {**_repo_json("archived"), "archived": True},
+                {**_repo_json("private"), "private": True},
+            ]
         )
 
-        requests_mock.get(
-            "https://api.github.com/orgs/testorg/repos?per_page=100&page=2&type=all",
-            json=page2_response,
+        client = GitHubClient(session=fake_session)
+        all_repos = client.list_org_repositories("testorg")
+        filtered = client.list_org_repositories(
+            "testorg", include_forks=False, include_archived=False, include_private=False
         )
 
-        client = GitHubClient()
-        repos = client.list_org_repositories("testorg")
+        assert [repo.name for repo in all_repos] == ["source", "fork", "archived", "private"]
+        assert all_repos[1].fork is True
+        assert [repo.name for repo in filtered] == ["source"]
 
-        assert len(repos) == 101
-        assert repos[0].name == "repo1"
-        assert repos[100].name == "repo101"
+    def test_list_repos_etag_cache(self, fake_session: MagicMock, tmp_path: Path) -> None:
+        """Test that cached pages are reused when the API returns 304."""
+        fake_session.request.side_effect = [
+            _response([_repo_json("repo1")], headers={"ETag": '"abc123"'}),
+            _response(status_code=304),
+        ]
+
+        client = GitHubClient(cache_dir=tmp_path, session=fake_session)
+        first = client.list_org_repositories("testorg")
+        second = client.list_org_repositories("testorg", use_cache=False)
+
+        assert first == second
+        first_call, second_call = fake_session.request.call_args_list
+        assert "If-None-Match" not in first_call.kwargs["headers"]
+        assert second_call.kwargs["headers"]["If-None-Match"] == '"abc123"'
+
+    def test_list_repos_last_modified_cache(self, fake_session: MagicMock, tmp_path: Path) -> None:
+        """Test that pages without an ETag are revalidated with If-Modified-Since."""
+        modified = "Wed, 14 Oct 2026 12:00:00 GMT"
+        fake_session.request.side_effect = [
+            _response([_repo_json("repo1")], headers={"Last-Modified": modified}),
+            _response(status_code=304),
+        ]
+
+        client = GitHubClient(cache_dir=tmp_path, session=fake_session)
+        first = client.list_org_repositories("testorg")
+        second = client.list_org_repositories("testorg", use_cache=False)
 
-    def test_list_repos_empty_org(self, requests_mock: requests_mock.Mocker) -> None:
+        assert first == second
+        first_call, second_call = fake_session.request.call_args_list
+        assert first_call.kwargs["headers"] == {}
+        assert second_call.kwargs["headers"] == {"If-Modified-Since": modified}
+
+    def test_list_repos_ttl_cache(self, fake_session: MagicMock, tmp_path: Path) -> None:
+        """Test that a recently cached list is returned without calling the API."""
+        fake_session.request.return_value = SINGLE_REPO_PAGE
+
+        client = GitHubClient(cache_dir=tmp_path, session=fake_session)
+        first = client.list_org_repositories("testorg")
+        second = client.list_org_repositories("testorg")
+        uncached = client.list_org_repositories("testorg", use_cache=False)
+
+        assert first == second == uncached
+        assert fake_session.request.call_count == 2
+
+    def test_list_repos_empty_org(self, fake_session: MagicMock) -> None:
         """Test listing repositories for an organization with no repos."""
-        requests_mock.get(
-            "https://api.github.com/orgs/emptyorg/repos",
-            json=[],
-        )
+        fake_session.request.return_value = _response([])
 
-        client = GitHubClient()
+        client = GitHubClient(session=fake_session)
         repos = client.list_org_repositories("emptyorg")
 
         assert len(repos) == 0
 
-    def test_list_repos_org_not_found(self, requests_mock: requests_mock.Mocker) -> None:
-        """Test listing repositories for a non-existent organization."""
-        requests_mock.get(
-            "https://api.github.com/orgs/nonexistent/repos",
-            status_code=404,
-            json={"message": "Not Found"},
+    @pytest.mark.parametrize(
+        ("outcome", "expected_error", "match"),
+        [
+            (
+                _response({"message": "Not Found"}, status_code=404),
+                OrganizationNotFoundError,
+                "Organization 'testorg' not found",
+            ),
+            (
+                _response(
+                    status_code=403,
+                    text="API rate limit exceeded",
+                    headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1234567890"},
+                ),
+                RateLimitError,
+                "rate limit exceeded.*1234567890",
+            ),
+            (
+                _response(
+                    status_code=403,
+                    text="Resource protected by organization SAML enforcement",
+                    headers={"X-RateLimit-Remaining": "4999"},
+                ),
+                GitHubAPIError,
+                "Access forbidden",
+            ),
+            (
+                _response(status_code=500, text="Internal Server Error"),
+                GitHubAPIError,
+                "status 500",
+            ),
+            (
+                requests.exceptions.ConnectionError("Network error"),
+                GitHubAPIError,
+                "Failed to fetch repositories",
+            ),
+            (_response(text="invalid json"), GitHubAPIError, "Failed to parse API response"),
+        ],
+        ids=[
+            "org_not_found",
+            "rate_limit",
+            "forbidden",
+            "api_error",
+            "network_error",
+            "invalid_json",
+        ],
+    )
+    def test_list_repos_error(
+        self,
+        fake_session: MagicMock,
+        outcome: requests.Response | Exception,
+        expected_error: type[GitHubAPIError],
+        match: str,
+    ) -> None:
+        """Test that failed requests raise the matching GitHubAPIError subclass."""
+        # A one-item side_effect returns a response or raises an exception
+        fake_session.request.side_effect = [outcome]
+
+        client = GitHubClient(session=fake_session)
+        with pytest.raises(expected_error, match=match) as exc_info:
+            client.list_org_repositories("testorg")
+
+        assert type(exc_info.value) is expected_error
+
+    def test_list_repos_secondary_rate_limit_retry(self, fake_session: MagicMock) -> None:
+        """Test that secondary rate limit responses are retried after Retry-After."""
+        fake_session.request.side_effect = [
+            _response(status_code=429, headers={"Retry-After": "7"}),
+            SINGLE_REPO_PAGE,
+        ]
+
+        client = GitHubClient(session=fake_session)
+        with patch("github_org_cloner.github_client.time.sleep") as mock_sleep:
+            repos = client.list_org_repositories("testorg")
+
+        assert [repo.name for repo in repos] == ["repo1"]
+        mock_sleep.assert_called_once_with(7)
+
+    def test_list_repos_secondary_rate_limit_exhausted(self, fake_session: MagicMock) -> None:
+        """Test that persistent secondary rate limiting raises after backing off."""
+        fake_session.request.return_value = _response(status_code=429)
+
+        client = GitHubClient(session=fake_session)
+        with patch("github_org_cloner.github_client.time.sleep") as mock_sleep:
+            with pytest.raises(RateLimitError):
+                client.list_org_repositories("testorg")
+
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [1, 2, 4]
+
+    def test_list_repos_secondary_rate_limit_forbidden(self, fake_session: MagicMock) -> None:
+        """Test that a 403 with Retry-After is treated as a secondary rate limit."""
+        fake_session.request.return_value = _response(status_code=403, headers={"Retry-After": "1"})
+
+        client = GitHubClient(session=fake_session)
+        with patch("github_org_cloner.github_client.time.sleep"):
+            with pytest.raises(RateLimitError):
+                client.list_org_repositories("testorg")
+
+        assert fake_session.request.call_count == GitHubClient.MAX_RATE_LIMIT_RETRIES + 1
+
+    def test_list_repos_throttles_near_limit(self, fake_session: MagicMock) -> None:
+        """Test that a nearly exhausted rate limit waits for the reset before the next request."""
+        fake_session.request.side_effect = [
+            _response(
+                [_repo_json(f"repo{i}") for i in range(1, 101)],
+                headers={
+                    "Link": '<https://api.github.com/orgs/testorg/repos?page=2>; rel="next"',
+                    "X-RateLimit-Remaining": "2",
+                    "X-RateLimit-Reset": "1060",
+                },
+            ),
+            PAGE_2_OF_2,
+        ]
+
+        client = GitHubClient(session=fake_session)
+        with (
+            patch("github_org_cloner.github_client.time.time", return_value=1000),
+            patch("github_org_cloner.github_client.time.sleep") as mock_sleep,
+        ):
+            repos = client.list_org_repositories("testorg")
+
+        assert len(repos) == 101
+        mock_sleep.assert_called_once_with(60)
+
+    def test_list_repos_sequential_when_budget_short(self, fake_session: MagicMock) -> None:
+        """Test that pages are fetched one at a time when the budget can't cover them all."""
+        last_link = '<https://api.github.com/orgs/testorg/repos?per_page=100&page=4>; rel="last"'
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def respond(method: str, url: str, **kwargs: Any) -> requests.Response:
+            nonlocal in_flight, peak
+            page = kwargs["params"]["page"]
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            threading.Event().wait(0.01)
+            with lock:
+                in_flight -= 1
+            return _response(
+                [_repo_json(f"repo{page}")],
+                headers={
+                    "Link": last_link,
+                    "X-RateLimit-Remaining": str(6 - page),
+                    "X-RateLimit-Reset": "1060",
+                },
+            )
+
+        fake_session.request.side_effect = respond
+
+        client = GitHubClient(session=fake_session)
+        with (
+            patch("github_org_cloner.github_client.time.time", return_value=1000),
+            patch("github_org_cloner.github_client.time.sleep") as mock_sleep,
+        ):
+            repos = client.list_org_repositories("testorg")
+
+        assert [repo.name for repo in repos] == [f"repo{page}" for page in range(1, 5)]
+        assert peak == 1
+        # Pages 3 and 4 are sent after the budget fell below the threshold
+        assert mock_sleep.call_count == 2
+
+    def test_list_repos_no_throttle_after_last_request(self, fake_session: MagicMock) -> None:
+        """Test that a nearly exhausted rate limit doesn't wait when nothing else is fetched."""
+        fake_session.request.return_value = _response(
+            [_repo_json("repo1")],
+            headers={"X-RateLimit-Remaining": "4", "X-RateLimit-Reset": "4600"},
         )
 
-        client = GitHubClient()
-        with pytest.raises(OrganizationNotFoundError, match="Organization 'nonexistent' not found"):
-            client.list_org_repositories("nonexistent")
+        client = GitHubClient(session=fake_session)
+        with (
+            patch("github_org_cloner.github_client.time.time", return_value=1000),
+            patch("github_org_cloner.github_client.time.sleep") as mock_sleep,
+        ):
+            client.list_org_repositories("testorg")
+
+        mock_sleep.assert_not_called()
 
-    def test_list_repos_rate_limit(self, requests_mock: requests_mock.Mocker) -> None:
-        """Test handling of rate limit errors."""
-        requests_mock.get(
-            "https://api.github.com/orgs/testorg/repos",
+    def test_list_repos_rate_limit_raises_without_waiting(self, fake_session: MagicMock) -> None:
+        """Test that an exhausted rate limit raises immediately instead of waiting for reset."""
+        fake_session.request.return_value = _response(
             status_code=403,
-            text="rate limit exceeded",
-            headers={"X-RateLimit-Reset": "1234567890"},
+            text="API rate limit exceeded",
+            headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "4600"},
         )
 
-        client = GitHubClient()
-        with pytest.raises(RateLimitError, match="rate limit exceeded"):
-            client.list_org_repositories("testorg")
+        client = GitHubClient(session=fake_session)
+        with (
+            patch("github_org_cloner.github_client.time.time", return_value=1000),
+            patch("github_org_cloner.github_client.time.sleep") as mock_sleep,
+        ):
+            with pytest.raises(RateLimitError, match="resets at: 4600"):
+                client.list_org_repositories("testorg")
 
-    def test_list_repos_with_token(self, requests_mock: requests_mock.Mocker) -> None:
-        """Test that token is included in request headers."""
-        mock_response = [
-            {
-                "name": "repo1",
-                "clone_url": "https://github.com/testorg/repo1.git",
-                "ssh_url": "git@github.com:testorg/repo1.git",
-                "description": "Test repo",
+        mock_sleep.assert_not_called()
+
+    def test_list_repos_stdlib_json(
+        self, fake_session: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that responses are parsed with the json module when orjson is missing."""
+        monkeypatch.setattr("github_org_cloner.github_client._json_loads", json.loads)
+        fake_session.request.return_value = TWO_REPO_PAGE
+
+        client = GitHubClient(session=fake_session)
+        repos = client.list_org_repositories("testorg")
+
+        assert [repo.name for repo in repos] == ["repo1", "repo2"]
+
+
+def _graphql_page(
+    names: list[str], end_cursor: str | None = None, has_next_page: bool = False
+) -> dict:
+    """Build a GraphQL repositories response for the given repository names."""
+    return {
+        "data": {
+            "organization": {
+                "repositories": {
+                    "pageInfo": {"endCursor": end_cursor, "hasNextPage": has_next_page},
+                    "nodes": [
+                        {
+                            "name": name,
+                            "url": f"https://github.com/testorg/{name}",
+                            "sshUrl": f"git@github.com:testorg/{name}.git",
+                            "description": None,
+                        }
+                        for name in names
+                    ],
+                }
             }
-        ]
+        }
+    }
+
+
+# Encoded once so requests-mock serves the bytes without reserializing them
+GRAPHQL_SINGLE_PAGE = orjson.dumps(_graphql_page(["repo1"]))
+GRAPHQL_FIRST_PAGE = orjson.dumps(_graphql_page(["repo1", "repo2"], "cursor1", has_next_page=True))
+GRAPHQL_LAST_PAGE = orjson.dumps(_graphql_page(["repo3"]))
+GRAPHQL_NOT_FOUND = orjson.dumps(
+    {
+        "data": {"organization": None},
+        "errors": [{"type": "NOT_FOUND", "message": "Could not resolve"}],
+    }
+)
+GRAPHQL_RATE_LIMITED = orjson.dumps(
+    {"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]}
+)
+GRAPHQL_QUERY_ERROR = orjson.dumps({"errors": [{"message": "Something went wrong"}]})
 
-        adapter = requests_mock.get(
-            "https://api.github.com/orgs/testorg/repos",
-            json=mock_response,
+
+class TestListOrgRepositoriesGraphQL:
+    """Tests for listing organization repositories via the GraphQL API."""
+
+    def test_list_repos_with_token(
+        self, requests_mock: "Mocker", gh_client_token: GitHubClient
+    ) -> None:
+        """Test that token is included in request headers."""
+        adapter = requests_mock.post(
+            "https://api.github.com/graphql",
+            content=GRAPHQL_SINGLE_PAGE,
         )
 
-        client = GitHubClient(token="test_token_123")
-        client.list_org_repositories("testorg")
+        repos = gh_client_token.list_org_repositories("testorg")
 
         # Verify Authorization header was sent
         assert adapter.last_request is not None
         assert adapter.last_request.headers["Authorization"] == "token test_token_123"
+        assert repos == [
+            Repository(
+                "repo1",
+                "https://github.com/testorg/repo1.git",
+                "git@github.com:testorg/repo1.git",
+                None,
+            )
+        ]
 
-    def test_list_repos_api_error(self, requests_mock: requests_mock.Mocker) -> None:
-        """Test handling of generic API errors."""
-        requests_mock.get(
-            "https://api.github.com/orgs/testorg/repos",
-            status_code=500,
-            text="Internal Server Error",
+    def test_list_repos_multiple_pages(
+        self, requests_mock: "Mocker", gh_client_token: GitHubClient
+    ) -> None:
+        """Test that pagination follows the endCursor until hasNextPage is false."""
+        adapter = requests_mock.post(
+            "https://api.github.com/graphql",
+            [
+                {"content": GRAPHQL_FIRST_PAGE},
+                {"content": GRAPHQL_LAST_PAGE},
+            ],
         )
 
-        client = GitHubClient()
-        with pytest.raises(GitHubAPIError, match="status 500"):
-            client.list_org_repositories("testorg")
+        repos = gh_client_token.list_org_repositories("testorg")
+
+        assert [repo.name for repo in repos] == ["repo1", "repo2", "repo3"]
+        assert adapter.call_count == 2
+        assert adapter.request_history[0].json()["variables"] == {
+            "login": "testorg",
+            "cursor": None,
+            "isFork": None,
+            "isArchived": None,
+            "privacy": None,
+        }
+        assert adapter.request_history[1].json()["variables"]["cursor"] == "cursor1"
+
+    def test_list_repos_filters_server_side(
+        self, requests_mock: "Mocker", gh_client_token: GitHubClient
+    ) -> None:
+        """Test that fork, archive and privacy filters are sent as query variables."""
+        adapter = requests_mock.post(
+            "https://api.github.com/graphql",
+            content=GRAPHQL_SINGLE_PAGE,
+        )
 
-    def test_list_repos_network_error(self, requests_mock: requests_mock.Mocker) -> None:
-        """Test handling of network errors."""
-        requests_mock.get(
-            "https://api.github.com/orgs/testorg/repos",
-            exc=requests.exceptions.ConnectionError("Network error"),
+        gh_client_token.list_org_repositories(
+            "testorg", include_forks=False, include_archived=False, include_private=False
         )
 
-        client = GitHubClient()
-        with pytest.raises(GitHubAPIError, match="Failed to fetch repositories"):
-            client.list_org_repositories("testorg")
+        variables = adapter.last_request.json()["variables"]
+        assert variables["isFork"] is False
+        assert variables["isArchived"] is False
+        assert variables["privacy"] == "PUBLIC"
+
+    def test_list_repos_org_not_found(
+        self, requests_mock: "Mocker", gh_client_token: GitHubClient
+    ) -> None:
+        """Test that a NOT_FOUND GraphQL error is reported as a missing organization."""
+        requests_mock.post(
+            "https://api.github.com/graphql",
+            content=GRAPHQL_NOT_FOUND,
+        )
 
-    def test_list_repos_invalid_json(self, requests_mock: requests_mock.Mocker) -> None:
-        """Test handling of invalid JSON responses."""
-        requests_mock.get(
-            "https://api.github.com/orgs/testorg/repos",
-            text="invalid json",
+        with pytest.raises(OrganizationNotFoundError, match="Organization 'nonexistent' not found"):
+            gh_client_token.list_org_repositories("nonexistent")
+
+    def test_list_repos_rate_limited(
+        self, requests_mock: "Mocker", gh_client_token: GitHubClient
+    ) -> None:
+        """Test that a RATE_LIMITED GraphQL error raises RateLimitError."""
+        requests_mock.post(
+            "https://api.github.com/graphql",
+            content=GRAPHQL_RATE_LIMITED,
         )
 
-        client = GitHubClient()
-        with pytest.raises(GitHubAPIError, match="Failed to parse API response"):
-            client.list_org_repositories("testorg")
+        with pytest.raises(RateLimitError, match="rate limit exceeded"):
+            gh_client_token.list_org_repositories("testorg")
+
+    def test_list_repos_query_error(
+        self, requests_mock: "Mocker", gh_client_token: GitHubClient
+    ) -> None:
+        """Test that other GraphQL errors raise GitHubAPIError."""
+        requests_mock.post(
+            "https://api.github.com/graphql",
+            content=GRAPHQL_QUERY_ERROR,
+        )
+
+        with pytest.raises(GitHubAPIError, match="Something went wrong"):
+            gh_client_token.list_org_repositories("testorg")
 
 
 class TestRepository:
@@ -237,10 +713,15 @@ class TestRepository:
             description="A test repository",
         )
 
-        assert repo.name == "test-repo"
-        assert repo.clone_url == "https://github.com/org/test-repo.git"
-        assert repo.ssh_url == "git@github.com:org/test-repo.git"
-        assert repo.description == "A test repository"
+        assert repo == Repository(
+            "test-repo",
+            "https://github.com/org/test-repo.git",
+            "git@github.com:org/test-repo.git",
+            "A test repository",
+            fork=False,
+            archived=False,
+            private=False,
+        )
 
     def test_repository_with_none_description(self) -> None:
         """Test creating a Repository with None description."""
@@ -252,3 +733,10 @@ class TestRepository:
         )
 
         assert repo.description is None
+
+    def test_repository_is_immutable(self, sample_repo: Repository) -> None:
+        """Test that repositories are frozen and have no per-instance __dict__."""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            sample_repo.name = "other"  # type: ignore[misc]
+
+        assert not hasattr(sample_repo, "__dict__")
@@ -0,0 +1,44 @@
+"""Tests for the shared thread pool."""
+
+from collections.abc import Iterator
+
+import pytest
+
+from github_org_cloner import pool
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool() -> Iterator[None]:
+    """Start and finish each test without a shared pool."""
+    pool.shutdown()
+    yield
+    pool.shutdown()
+
+
+class TestGetPool:
+    """Tests for getting the shared thread pool."""
+
+    def test_reuses_pool(self) -> None:
+        """Test that the same pool is returned for repeated calls."""
+        assert pool.get_pool(4) is pool.get_pool(4)
+
+    def test_smaller_request_reuses_pool(self) -> None:
+        """Test that asking for fewer workers keeps the existing pool."""
+        executor = pool.get_pool(4)
+
+        assert pool.get_pool(2) is executor
+
+    def test_grows_pool(self) -> None:
+        """Test that asking for more workers replaces the pool with a larger one."""
+        executor = pool.get_pool(2)
+        larger = pool.get_pool(8)
+
+        assert larger is not executor
+        assert larger.submit(lambda: 42).result() == 42
+
+    def test_shutdown(self) -> None:
+        """Test that a new pool is created after shutdown."""
+        executor = pool.get_pool(2)
+        pool.shutdown()
+
+        assert pool.get_pool(2) is not executor
@@ -0,0 +1,175 @@
+"""Tests for the post-clone setup runner."""
+
+import logging
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from github_org_cloner.setup_runner import run_optional_setup, run_setup_for_all
+
+# Tests that run real scripts through the persistent POSIX shell
+posix_only = pytest.mark.skipif(
+    sys.platform == "win32", reason="persistent shell and POSIX paths are not used on Windows"
+)
+
+
+@pytest.fixture
+def python_repo(tmp_path: Path) -> Path:
+    """Create a repository containing Python and Makefile markers."""
+    repo_path = tmp_path / "py-repo"
+    repo_path.mkdir()
+    (repo_path / "pyproject.toml").touch()
+    (repo_path / "Makefile").touch()
+    return repo_path
+
+
+class TestRunOptionalSetup:
+    """Tests for checking a single repository."""
+
+    def test_detects_project_types(
+        self,
+        python_repo: Path,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test that marker files produce setup suggestions."""
+        with caplog.at_level(logging.INFO):
+            run_optional_setup(python_repo)
+
+        assert "Detected Python project in py-repo" in caplog.text
+        assert "pip install -e ." in caplog.text
+        assert "Found Makefile in py-repo" in caplog.text
+        assert "Node.js" not in caplog.text
+
+    def test_missing_path(self, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that a missing repository path only logs a warning."""
+        run_optional_setup(tmp_path / "missing")
+
+        assert "Repository path does not exist" in caplog.text
+
+    def test_setup_script_suggested(
+        self,
+        python_repo: Path,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test that setup.sh is only suggested when auto_run is False."""
+        (python_repo / "setup.sh").touch()
+
+        with patch("github_org_cloner.setup_runner.subprocess.run") as mock_run:
+            with caplog.at_level(logging.INFO):
+                run_optional_setup(python_repo)
+
+            mock_run.assert_not_called()
+
+        assert "Run it manually or use --run-setup flag" in caplog.text
+
+    @posix_only
+    def test_setup_script_run(self, python_repo: Path) -> None:
+        """Test that setup.sh is run from the repository directory when auto_run is True."""
+        (python_repo / "setup.sh").write_text('pwd > ran-from\necho "$0" > ran-as\n')
+
+        run_optional_setup(python_repo, auto_run=True)
+
+        assert (python_repo / "ran-from").read_text().strip() == str(python_repo)
+        assert (python_repo / "ran-as").read_text().strip() == "setup.sh"
+
+    @posix_only
+    def test_setup_script_reuses_shell(self, tmp_path: Path) -> None:
+        """Test that scripts run on the same thread share one persistent shell."""
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "setup.sh").write_text("echo $PPID > shell-pid\n")
+
+        run_optional_setup(tmp_path / "a", auto_run=True)
+        run_optional_setup(tmp_path / "b", auto_run=True)
+
+        shell_pids = {(tmp_path / name / "shell-pid").read_text() for name in ("a", "b")}
+        assert len(shell_pids) == 1
+
+    @posix_only
+    def test_setup_script_failure(
+        self,
+        python_repo: Path,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test that a failing setup.sh is logged, not raised."""
+        (python_repo / "setup.sh").write_text("echo boom >&2\nexit 3\n")
+
+        run_optional_setup(python_repo, auto_run=True)
+
+        assert "Setup script failed for py-repo: boom" in caplog.text
+
+    def test_setup_messages_logged_in_order(
+        self,
+        python_repo: Path,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test that a script failure is logged after the repository's header, not before."""
+        (python_repo / "setup.sh").touch()
+        error = subprocess.CalledProcessError(3, ["bash", "setup.sh"], stderr="boom")
+
+        with (
+            patch("github_org_cloner.setup_runner._run_setup_script", side_effect=error),
+            caplog.at_level(logging.INFO),
+        ):
+            run_optional_setup(python_repo, auto_run=True)
+
+        assert [(record.levelno, record.getMessage()) for record in caplog.records[:3]] == [
+            (logging.INFO, "Checking for setup options in py-repo"),
+            (logging.INFO, "Found setup.sh in py-repo, running it..."),
+            (logging.ERROR, "Setup script failed for py-repo: boom"),
+        ]
+
+    @posix_only
+    def test_setup_script_timeout(
+        self,
+        python_repo: Path,
+        caplog: pytest.LogCaptureFixture,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that a setup.sh running past the timeout is killed and logged."""
+        monkeypatch.setattr("github_org_cloner.setup_runner.SETUP_TIMEOUT", 0.5)
+        (python_repo / "setup.sh").write_text("sleep 30\n")
+
+        run_optional_setup(python_repo, auto_run=True)
+
+        assert "Setup script timeout for py-repo" in caplog.text
+
+    def test_setup_script_without_persistent_shell(self, python_repo: Path) -> None:
+        """Test that setup.sh runs in a fresh bash when the persistent shell can't start."""
+        (python_repo / "setup.sh").touch()
+
+        with (
+            patch("github_org_cloner.setup_runner._get_shell", side_effect=OSError),
+            patch("github_org_cloner.setup_runner.subprocess.run") as mock_run,
+        ):
+            mock_run.return_value = MagicMock(stdout="")
+
+            run_optional_setup(python_repo, auto_run=True)
+
+            mock_run.assert_called_once()
+            assert mock_run.call_args[0][0] == ["bash", "setup.sh"]
+            assert mock_run.call_args.kwargs["cwd"] == python_repo
+
+
+class TestRunSetupForAll:
+    """Tests for checking multiple repositories."""
+
+    def test_checks_every_repository(self, tmp_path: Path) -> None:
+        """Test that every repository path is checked."""
+        repo_paths = [tmp_path / f"repo{i}" for i in range(3)]
+
+        with patch("github_org_cloner.setup_runner.run_optional_setup") as mock_setup:
+            run_setup_for_all(repo_paths, auto_run=True)
+
+        assert sorted(call.args[0] for call in mock_setup.call_args_list) == repo_paths
+        assert all(call.args[1] is True for call in mock_setup.call_args_list)
+
+    def test_empty_list(self) -> None:
+        """Test that an empty list is a no-op."""
+        with patch("github_org_cloner.setup_runner.run_optional_setup") as mock_setup:
+            run_setup_for_all([])
+
+        mock_setup.assert_not_called()